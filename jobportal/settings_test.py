@@ -0,0 +1,21 @@
+"""
+Settings for the test suite, which ``manage.py test`` uses unless
+DJANGO_SETTINGS_MODULE or --settings says otherwise.
+"""
+from .settings import *  # noqa: F401,F403
+
+# A second SQLite database plays the replica; tests switch routing to it with
+# override_settings(DATABASE_REPLICAS=['replica'])
+DATABASES = {
+    **DATABASES,  # noqa: F405
+    'replica': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db-replica.sqlite3'},  # noqa: F405
+}
+
+# Per-process memory, so clearing it between tests never touches the
+# project's shared cache directory
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'jobportal-tests',
+    }
+}
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Job, Application
+from .models import User, Job, Application, ApplicationStatusChange
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -27,10 +27,11 @@ class CustomUserAdmin(UserAdmin):
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
-    list_display = ('title', 'company_name', 'location', 'posted_by', 'created_at')
+    list_display = ('title', 'company_name', 'location', 'posted_by', 'application_count', 'created_at')
     list_filter = ('location', 'created_at', 'posted_by')
     search_fields = ('title', 'company_name', 'description', 'posted_by__username')
     raw_id_fields = ('posted_by',)
+    list_select_related = ('posted_by',)
     date_hierarchy = 'created_at'
 
 @admin.register(Application)
@@ -39,5 +40,15 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_filter = ('applied_at', 'status')
     search_fields = ('job__title', 'applicant__username', 'cover_letter')
     raw_id_fields = ('job', 'applicant')
+    # __str__ and the list columns read the job and applicant
+    list_select_related = ('job', 'applicant')
     date_hierarchy = 'applied_at'
-    list_editable = ('status',)
\ No newline at end of file
+    list_editable = ('status',)
+
+@admin.register(ApplicationStatusChange)
+class ApplicationStatusChangeAdmin(admin.ModelAdmin):
+    list_display = ('application', 'old_status', 'new_status', 'changed_by', 'changed_at', 'notified_at', 'attempts')
+    list_filter = ('new_status', 'changed_at', 'notified_at')
+    raw_id_fields = ('application', 'changed_by')
+    list_select_related = ('application__job', 'application__applicant', 'changed_by')
+    date_hierarchy = 'changed_at'
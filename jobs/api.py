@@ -0,0 +1,181 @@
+import json
+from datetime import datetime, time, timezone as dt_timezone
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import require_GET
+
+from .locations import resolve_location, within_radius
+from .models import Job
+from .pagination import CursorPaginator
+from .search import search_jobs
+from .suggest import KINDS, MAX_RESULTS, suggest
+
+# Fields a client may ask for with ?fields=
+API_FIELDS = [
+    'id', 'title', 'company_name', 'location', 'job_type', 'salary',
+    'description', 'requirements', 'benefits', 'created_at', 'updated_at',
+    'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+    'location_key', 'location_region', 'location_country', 'latitude', 'longitude', 'is_remote',
+]
+DEFAULT_FIELDS = ['id', 'title', 'company_name', 'location', 'job_type', 'salary', 'created_at']
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+EXPORT_CHUNK_SIZE = 2000
+SUGGEST_MAX_AGE = 60
+DEFAULT_RADIUS = 50
+MAX_RADIUS = 500
+
+
+class APIError(Exception):
+    pass
+
+
+def _selected_fields(request):
+    fields = request.GET.get('fields')
+    if not fields:
+        return DEFAULT_FIELDS
+    fields = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = sorted(set(fields) - set(API_FIELDS))
+    if unknown:
+        raise APIError(f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(API_FIELDS)}.")
+    return fields
+
+
+def _parse_since(since):
+    """A date (midnight UTC) or a full ISO 8601 datetime, as an aware datetime."""
+    try:
+        # Both raise ValueError on well-formed but impossible values ("2024-02-30")
+        posted_since = parse_datetime(since)
+        if posted_since is None and parse_date(since):
+            posted_since = datetime.combine(parse_date(since), time.min)
+    except ValueError:
+        posted_since = None
+    if posted_since is None:
+        raise APIError('since must be an ISO 8601 date or datetime.')
+    if timezone.is_naive(posted_since):
+        posted_since = timezone.make_aware(posted_since, dt_timezone.utc)
+    return posted_since
+
+
+def _filtered_jobs(request):
+    jobs = Job.objects.all()
+    job_type = request.GET.get('job_type')
+    if job_type:
+        if job_type not in dict(Job.JOB_TYPE_CHOICES):
+            raise APIError(f'Unknown job_type: {job_type}.')
+        jobs = jobs.filter(job_type=job_type)
+
+    location = request.GET.get('location')
+    if location:
+        place = resolve_location(location)
+        # Known places match on the canonical city, whatever spelling the job used
+        jobs = jobs.filter(location_key=place.key) if place else jobs.filter(location__icontains=location)
+
+    if request.GET.get('remote', '').casefold() in ('1', 'true'):
+        jobs = jobs.filter(is_remote=True)
+
+    near = request.GET.get('near')
+    if near:
+        place = resolve_location(near)
+        if place is None:
+            raise APIError(f'Unknown place: {near}.')
+        try:
+            radius = float(request.GET.get('radius', DEFAULT_RADIUS))
+        except ValueError:
+            radius = -1
+        if not 0 < radius <= MAX_RADIUS:
+            raise APIError(f'radius must be a number of kilometres up to {MAX_RADIUS}.')
+        jobs = within_radius(jobs, place, radius)
+
+    since = request.GET.get('since')
+    if since:
+        jobs = jobs.filter(created_at__gte=_parse_since(since))
+
+    query = request.GET.get('q')
+    if query:
+        jobs = search_jobs(jobs, query, rank=False)
+    return jobs
+
+
+def _error(message):
+    return JsonResponse({'error': message}, status=400)
+
+
+@require_GET
+def job_search(request):
+    """Filtered jobs as JSON, newest first, paginated with opaque cursors."""
+    try:
+        fields = _selected_fields(request)
+        jobs = _filtered_jobs(request)
+    except APIError as error:
+        return _error(str(error))
+    try:
+        limit = min(int(request.GET.get('limit', PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        return _error('limit must be an integer.')
+    if limit < 1:
+        return _error('limit must be positive.')
+
+    # The cursor needs created_at and id whatever fields were requested
+    jobs = jobs.only(*set(fields) | {'id', 'created_at'})
+    page = CursorPaginator(jobs, limit).page(request.GET.get('cursor'))
+
+    def page_url(cursor):
+        if cursor is None:
+            return None
+        params = request.GET.copy()
+        params['cursor'] = cursor
+        return request.build_absolute_uri('?' + params.urlencode())
+
+    return JsonResponse({
+        'results': [{field: getattr(job, field) for field in fields} for job in page],
+        'next': page_url(page.next_cursor),
+        'previous': page_url(page.previous_cursor),
+    })
+
+
+@require_GET
+def job_suggest(request):
+    """Typeahead completions for ?q=, from the in-memory index in jobs/suggest.py."""
+    query = request.GET.get('q', '')
+    kind = request.GET.get('kind') or None
+    if kind is not None and kind not in KINDS:
+        return _error(f"Unknown kind: {kind}. Choose from: {', '.join(KINDS)}.")
+    try:
+        limit = min(int(request.GET.get('limit', MAX_RESULTS)), MAX_RESULTS)
+    except ValueError:
+        return _error('limit must be an integer.')
+    if limit < 1:
+        return _error('limit must be positive.')
+
+    response = JsonResponse({'query': query, 'suggestions': suggest(query, kind, limit)})
+    # The same keystrokes come from many visitors
+    patch_cache_control(response, public=True, max_age=SUGGEST_MAX_AGE)
+    return response
+
+
+@require_GET
+def job_export(request):
+    """
+    Every job matching the filters as newline-delimited JSON.
+
+    Rows are streamed from a server-side iterator in chunks, so exporting the
+    whole catalog runs in constant memory.
+    """
+    try:
+        fields = _selected_fields(request)
+        jobs = _filtered_jobs(request)
+    except APIError as error:
+        return _error(str(error))
+
+    rows = jobs.order_by('pk').values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    response = StreamingHttpResponse(
+        (json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in rows),
+        content_type='application/x-ndjson',
+    )
+    response['Content-Disposition'] = 'attachment; filename="jobs.ndjson"'
+    return response
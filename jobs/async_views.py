@@ -0,0 +1,157 @@
+"""
+Native async versions of the read-heavy pages, routed instead of their
+counterparts in views.py when ASYNC_VIEWS is on (see jobs/urls.py).
+
+Only worth it under an ASGI server: under WSGI every coroutine gets its own
+event loop. Every query, the async ORM methods included, still runs through
+sync_to_async on the one shared thread, one after another, so a view's
+queries are awaited in sequence; running them concurrently would need a
+natively async database layer. Writes (applying, changing status) stay on
+the sync views.
+"""
+from calendar import timegm
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth, messages
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import views
+from .cache import (
+    acached_job, cache_public_page, cached_similar_jobs, job_detail_etag, job_detail_last_modified, job_state,
+    listing_etag, listing_last_modified, listing_version, revalidate,
+)
+from .forms import ApplicationForm
+from .models import Application, Job
+
+arender = sync_to_async(render)
+
+
+def login_required(view_func):
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        # The lazy request.user reads the session and users table; resolve it
+        # off the event loop once, before anything touches it
+        request.user = await sync_to_async(auth.get_user)(request)
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+def condition(etag_func, last_modified_func):
+    """django.views.decorators.http.condition for coroutine views."""
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            def validators():
+                etag = etag_func(request, *args, **kwargs)
+                last_modified = last_modified_func(request, *args, **kwargs)
+                return (
+                    quote_etag(etag) if etag else None,
+                    timegm(last_modified.utctimetuple()) if last_modified else None,
+                )
+
+            etag, last_modified = await sync_to_async(validators)()
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+            if request.method in ('GET', 'HEAD'):
+                if last_modified and not response.has_header('Last-Modified'):
+                    response['Last-Modified'] = http_date(last_modified)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+@revalidate
+@condition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page
+async def job_list(request):
+    # Search, facets and pagination are shared with the sync view
+    context = await sync_to_async(views.job_list_context)(request)
+    return await arender(request, 'jobs/job_list.html', context)
+
+
+@login_required
+@revalidate
+@condition(etag_func=job_detail_etag, last_modified_func=job_detail_last_modified)
+async def job_detail(request, job_id):
+    if request.method == 'POST':
+        # Applying streams an upload and writes in a transaction
+        return await sync_to_async(views.job_detail)(request, job_id)
+
+    # The viewer's application and the live count came with the validators'
+    # query; the job itself usually comes from the cache
+    state = await sync_to_async(job_state)(request, job_id)
+    if state is None:
+        # Deleted, possibly while still cached
+        raise Http404('No Job matches the given query.')
+    job = await acached_job(job_id)
+    similar_jobs = await sync_to_async(cached_similar_jobs)(job_id)
+    version = await sync_to_async(listing_version)()
+    job.application_count = state['application_count']
+    has_applied = state['applied_at'] is not None
+
+    return await arender(request, 'jobs/job_detail.html', {
+        'job': job,
+        'form': ApplicationForm() if not has_applied else None,
+        'has_applied': has_applied,
+        'similar_jobs': similar_jobs,
+        'listing_version': version,
+        'cache_timeout': settings.JOB_PAGE_CACHE_TIMEOUT,
+    })
+
+
+@login_required
+async def dashboard(request):
+    if request.user.is_employer:
+        jobs = Job.objects.filter(posted_by=request.user).order_by('-created_at')
+        return await arender(request, 'jobs/employer_dashboard.html', {'jobs': [job async for job in jobs]})
+
+    status_filter = request.GET.get('status', '')
+    applications = Application.objects.filter(applicant=request.user).select_related('job')
+    if status_filter and status_filter != 'all':
+        applications = applications.filter(status=status_filter)
+    return await arender(request, 'jobs/applicant_dashboard.html', {
+        'applications': [application async for application in applications],
+    })
+
+
+@login_required
+async def manage_applications(request, job_id):
+    status_filter = request.GET.get('status', 'all')
+    job = await Job.objects.filter(pk=job_id).afirst()
+    if job is None:
+        raise Http404('No Job matches the given query.')
+    if request.user.pk != job.posted_by_id:
+        messages.error(request, "You don't have permission to view these applications.")
+        return redirect('dashboard')
+
+    applications = Application.objects.filter(job=job).select_related('applicant')
+    if status_filter != 'all' and status_filter in dict(Application.STATUS_CHOICES):
+        applications = applications.filter(status=status_filter)
+    applications = [application async for application in applications.order_by('-status', '-applied_at')]
+
+    return await arender(request, 'jobs/manage_applications.html', {
+        'job': job,
+        'applications': applications,
+        # Stored counters, no counting needed
+        'status_counts': {
+            'total': job.application_count,
+            'pending': job.pending_count,
+            'approved': job.approved_count,
+            'rejected': job.rejected_count,
+        },
+        'current_status': status_filter,
+    })
@@ -0,0 +1,261 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db.models import DateTimeField, Max, OuterRef, Subquery, Value
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from .models import Application, Job
+from .routers import note_primary_write
+from .similar import model_generation, neighbor_ids
+
+SIMILAR_JOBS_SHOWN = 4
+
+VERSION_KEY = 'jobs:version'
+DELETED_AT_KEY = 'jobs:last-deleted-at'
+
+
+def listing_version():
+    """
+    Version shared by every cached listing page, count and fragment.
+
+    Job save/delete signals bump it, so cached entries built before a post
+    or edit are simply never read again instead of being deleted one by one.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted version never reuses an old number
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_listing_version():
+    # Before the new version exists, so it is never filled from a lagging replica
+    note_primary_write()
+    # A fresh clock value rather than incr(), which the file cache implements
+    # as get + set: two concurrent bumps could otherwise land on one version
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def record_job_deleted():
+    # Deletions leave no updated_at behind; remember when the last one happened
+    cache.set(DELETED_AT_KEY, time.time(), None)
+
+
+def versioned_key(prefix, *parts):
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f'jobs:{prefix}:{listing_version()}:{digest}'
+
+
+def cached_job(job_id):
+    """The Job with ``job_id`` from the cache, or from the database (404 if missing)."""
+    key = versioned_key('job', job_id)
+    job = cache.get(key)
+    if job is None:
+        job = get_object_or_404(Job, pk=job_id)
+        cache.set(key, job, settings.JOB_PAGE_CACHE_TIMEOUT)
+    return job
+
+
+async def acached_job(job_id):
+    """Async :func:`cached_job`."""
+    key = await sync_to_async(versioned_key)('job', job_id)
+    job = await cache.aget(key)
+    if job is None:
+        try:
+            job = await Job.objects.aget(pk=job_id)
+        except Job.DoesNotExist:
+            raise Http404('No Job matches the given query.')
+        await cache.aset(key, job, settings.JOB_PAGE_CACHE_TIMEOUT)
+    return job
+
+
+def cached_similar_jobs(job_id):
+    """
+    Job cards for the jobs most similar to ``job_id`` (see jobs/similar.py),
+    cached per job until the next Job write or model rebuild. Building them
+    is one primary key query; none when the model has nothing for the job.
+    """
+    generation = model_generation()
+    if generation is None:
+        return []
+    key = versioned_key('similar', generation, job_id)
+    jobs = cache.get(key)
+    if jobs is None:
+        ids = neighbor_ids(job_id, generation)
+        # Deleted jobs drop out here; there are spares in the list
+        found = Job.objects.for_listing().in_bulk(ids) if ids else {}
+        jobs = [found[pk] for pk in ids if pk in found][:SIMILAR_JOBS_SHOWN]
+        cache.set(key, jobs, settings.JOB_PAGE_CACHE_TIMEOUT)
+    return jobs
+
+
+def _has_session(request):
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def _is_cacheable(request):
+    # Visitors without a session are anonymous and see the same page, and
+    # checking that does not touch the database
+    return (
+        request.method in ('GET', 'HEAD')
+        and not _has_session(request)
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def _page_key(request):
+    return versioned_key('page', request.path, sorted(request.GET.lists()))
+
+
+def _cacheable_response(response):
+    return response.status_code == 200 and not response.streaming and not response.cookies
+
+
+def cache_public_page(view_func):
+    """
+    Serve anonymous GET requests from the cache, keyed by path and query
+    string under the current listing version. A warm hit runs no queries.
+    Works on both sync and async views.
+    """
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            if not _is_cacheable(request):
+                return await view_func(request, *args, **kwargs)
+
+            key = await sync_to_async(_page_key)(request)
+            cached = await cache.aget(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = await view_func(request, *args, **kwargs)
+                if _cacheable_response(response):
+                    await cache.aset(key, (response.content, response['Content-Type']), settings.JOB_PAGE_CACHE_TIMEOUT)
+            patch_vary_headers(response, ['Cookie'])
+            return response
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable(request):
+            return view_func(request, *args, **kwargs)
+
+        key = _page_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = view_func(request, *args, **kwargs)
+            if _cacheable_response(response):
+                cache.set(key, (response.content, response['Content-Type']), settings.JOB_PAGE_CACHE_TIMEOUT)
+        patch_vary_headers(response, ['Cookie'])
+        return response
+
+    return wrapper
+
+
+# Validators for conditional GETs (django.views.decorators.http.condition).
+# They are checked before the page cache and before any rendering.
+
+def _mark_revalidate(request, response):
+    if request.method in ('GET', 'HEAD'):
+        patch_cache_control(response, no_cache=True)
+        if _has_session(request):
+            patch_cache_control(response, private=True)
+    return response
+
+
+def revalidate(view_func):
+    """
+    ``Cache-Control: no-cache`` (and ``private`` with a session) on GET
+    responses. Without it browsers guess a freshness lifetime from
+    Last-Modified and may show a stale page without asking; with it every
+    visit is a conditional GET, answered by a 304 while nothing changed.
+    Put it above ``condition`` so 304s carry it too.
+    """
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            return _mark_revalidate(request, await view_func(request, *args, **kwargs))
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        return _mark_revalidate(request, view_func(request, *args, **kwargs))
+
+    return wrapper
+
+
+def _user_key(request):
+    # Only logged-in pages differ per user; anonymous visitors share one
+    return request.user.pk if _has_session(request) else None
+
+
+def listing_last_modified(request, *args, **kwargs):
+    key = versioned_key('last-modified')
+    last_modified = cache.get(key)
+    if last_modified is None:
+        # MAX over the updated_at index
+        last_modified = Job.objects.aggregate(latest=Max('updated_at'))['latest']
+        deleted_at = cache.get(DELETED_AT_KEY)
+        if deleted_at is not None:
+            deleted_at = datetime.fromtimestamp(deleted_at, timezone.utc)
+            last_modified = max(last_modified, deleted_at) if last_modified else deleted_at
+        cache.set(key, last_modified or False, settings.JOB_PAGE_CACHE_TIMEOUT)
+    return last_modified or None
+
+
+def listing_etag(request, *args, **kwargs):
+    return hashlib.md5(repr((
+        listing_version(), listing_last_modified(request), request.get_full_path(), _user_key(request),
+    )).encode()).hexdigest()
+
+
+def job_state(request, job_id):
+    """
+    ``updated_at``, ``application_count`` and the viewer's ``applied_at`` for a
+    job, or None if it does not exist. One primary key lookup (the viewer's
+    application comes from the unique (job, applicant) index), memoized on
+    the request so the validators and the view share it.
+    """
+    if not hasattr(request, '_job_state'):
+        applied_at = Value(None, output_field=DateTimeField())
+        if request.user.is_authenticated:
+            applied_at = Subquery(
+                Application.objects.filter(job=OuterRef('pk'), applicant=request.user).values('applied_at')[:1]
+            )
+        request._job_state = (
+            Job.objects.filter(pk=job_id).annotate(applied_at=applied_at)
+            .values('updated_at', 'application_count', 'applied_at').first()
+        )
+    return request._job_state
+
+
+def job_detail_last_modified(request, job_id):
+    state = job_state(request, job_id)
+    if state is None:
+        return None
+    return max(value for value in (state['updated_at'], state['applied_at']) if value)
+
+
+def job_detail_etag(request, job_id):
+    state = job_state(request, job_id)
+    if state is None:
+        return None
+    return hashlib.md5(repr((
+        job_id, sorted(state.items()), request.user.pk, model_generation(),
+    )).encode()).hexdigest()
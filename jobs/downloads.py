@@ -0,0 +1,187 @@
+import csv
+import io
+import mimetypes
+import os
+import re
+import zipfile
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+# Already-compressed formats are stored as is; deflating them again costs CPU for nothing
+STORED_EXTENSIONS = {'.pdf', '.docx', '.zip', '.png', '.jpg', '.jpeg'}
+
+
+def _byte_range(request, size, etag, last_modified):
+    """
+    The single ``(start, end)`` range requested, None to send the whole file,
+    or False if the range cannot be satisfied.
+    """
+    header = request.headers.get('Range')
+    if not header or request.method != 'GET':
+        return None
+    if_range = request.headers.get('If-Range')
+    if if_range and if_range != etag and parse_http_date_safe(if_range) != int(last_modified):
+        # The client's partial copy is stale; send it everything
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        # Multiple or malformed ranges: serving the whole file is allowed
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _read_range(path, start, end):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, name, download_name):
+    """
+    Send the stored file ``name`` as an attachment called ``download_name``.
+
+    Answers If-None-Match/If-Modified-Since with 304 and single-range
+    requests with 206. Whole files go out through FileResponse, which lets
+    the WSGI server use sendfile(). With RESUME_SENDFILE_MODE set, the
+    transfer is handed to the fronting proxy instead (nginx X-Accel-Redirect
+    or Apache/lighttpd X-Sendfile), which also handles ranges itself.
+    """
+    try:
+        path = default_storage.path(name)
+        stat = os.stat(path)
+    except (NotImplementedError, OSError):
+        raise Http404('Resume not found.')
+
+    etag = quote_etag(f'{stat.st_size:x}-{int(stat.st_mtime):x}')
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is not None:
+        return response
+
+    content_type = mimetypes.guess_type(download_name)[0] or 'application/octet-stream'
+    mode = settings.RESUME_SENDFILE_MODE
+    byte_range = None
+    if mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = settings.RESUME_ACCEL_REDIRECT_PREFIX + name
+    elif mode == 'x-sendfile':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = path
+    else:
+        byte_range = _byte_range(request, stat.st_size, etag, stat.st_mtime)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(_read_range(path, start, end), status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = end - start + 1
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        response['Accept-Ranges'] = 'bytes'
+
+    response['Content-Disposition'] = f'attachment; filename="{download_name}"'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    # Resumes are private; keep them out of shared caches
+    response['Cache-Control'] = 'private'
+    return response
+
+
+class _ZipBuffer:
+    """
+    Write-only sink for ZipFile. It has no tell()/seek(), so ZipFile writes
+    sizes in data descriptors instead of going back to patch local headers,
+    and whatever it has written so far can be drained and sent.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _zip_info(name, modified, size):
+    info = zipfile.ZipInfo(name, date_time=timezone.localtime(modified).timetuple()[:6])
+    extension = os.path.splitext(name)[1].lower()
+    info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+    # Lets ZipFile decide up front whether the entry needs ZIP64 fields
+    info.file_size = size
+    return info
+
+
+def _resume_entries(rows):
+    """(archive name, path or None, row) for each (pk, username, email, status, applied_at, resume) row."""
+    for row in rows:
+        pk, username, _, _, _, resume = row
+        path = default_storage.path(resume)
+        name = f'resumes/{username}-{pk}{os.path.splitext(resume)[1]}'
+        yield name, path if os.path.isfile(path) else None, row
+
+
+def stream_resume_zip(rows):
+    """
+    Yield a ZIP archive of resumes plus a manifest.csv, piece by piece.
+
+    ``rows`` is a callable returning a fresh iterator of
+    ``(pk, username, email, status, applied_at, resume)`` tuples; it is read
+    twice, once for the manifest and once for the files, so nothing but the
+    current chunk of one file is ever held in memory.
+    """
+    return (chunk for chunk in _resume_zip_chunks(rows) if chunk)
+
+
+def _resume_zip_chunks(rows):
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        with archive.open(_zip_info('manifest.csv', timezone.now(), 0), 'w') as manifest:
+            text = io.TextIOWrapper(manifest, encoding='utf-8', newline='')
+            writer = csv.writer(text)
+            writer.writerow(['applicant', 'email', 'status', 'applied_at', 'resume'])
+            for name, path, (_, username, email, status, applied_at, _) in _resume_entries(rows()):
+                writer.writerow([username, email, status, applied_at.isoformat(), name if path else 'missing'])
+                text.flush()
+                yield buffer.drain()
+            text.detach()
+
+        for name, path, (*_, applied_at, _) in _resume_entries(rows()):
+            if path is None:
+                continue
+            with open(path, 'rb') as source, archive.open(_zip_info(name, applied_at, os.path.getsize(path)), 'w') as entry:
+                while chunk := source.read(CHUNK_SIZE):
+                    entry.write(chunk)
+                    yield buffer.drain()
+    # The central directory, written when the archive is closed
+    yield buffer.drain()
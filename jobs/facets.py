@@ -0,0 +1,186 @@
+"""
+Listing filters, sort orders and the facet counts.
+
+Counts come from one grouped aggregate per facet and are cached under the
+listing version, so any Job write refreshes them. Each facet is counted with
+every other active filter applied but not its own, so the options of a facet
+stay visible (with their counts) once one of them is picked.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .cache import versioned_key
+from .locations import gazetteer, location_label, normalize_location, resolve_location, within_radius
+from .models import Job
+from .salary import CURRENCIES, DEFAULT_CURRENCY
+
+# (value, label, days) for the posting-age filter
+AGE_BUCKETS = [
+    ('1', 'Last 24 hours', 1),
+    ('7', 'Last 7 days', 7),
+    ('30', 'Last 30 days', 30),
+]
+LOCATION_FACET_SIZE = 10
+RADIUS_CHOICES = [10, 25, 50, 100, 250]
+DEFAULT_RADIUS = 50
+
+# ?sort= values; each matches one of the Job indexes. Every sort ends in id,
+# so rows with equal values keep one order across pages
+SORTS = {
+    'latest': ['-created_at', '-id'],
+    'oldest': ['created_at', 'id'],
+    'salary_high': ['-salary_max', '-created_at', '-id'],
+    'salary_low': ['salary_min', '-created_at', '-id'],
+}
+SORT_CHOICES = [
+    ('latest', 'Latest First'),
+    ('oldest', 'Oldest First'),
+    ('salary_high', 'Highest Salary'),
+    ('salary_low', 'Lowest Salary'),
+]
+
+
+def selected_filters(params):
+    """The valid filters in ``params`` (a QueryDict) as ``{param: value}``; invalid values are ignored."""
+    filters = {}
+    job_type = params.get('job_type')
+    if job_type in dict(Job.JOB_TYPE_CHOICES):
+        filters['job_type'] = job_type
+    location = normalize_location(params.get('location', ''))
+    if location:
+        filters['location'] = location
+    posted = params.get('posted')
+    if posted in {value for value, _, _ in AGE_BUCKETS}:
+        filters['posted'] = posted
+    if params.get('remote', '').casefold() in ('1', 'true', 'on'):
+        filters['remote'] = True
+    place = resolve_location(params.get('near', ''))
+    if place:
+        filters['near'] = place.key
+        radius = params.get('radius', '')
+        filters['radius'] = int(radius) if radius.isdigit() and int(radius) in RADIUS_CHOICES else DEFAULT_RADIUS
+    # Monthly amounts, see jobs/salary.py
+    for name in ('min_salary', 'max_salary'):
+        value = params.get(name, '').replace(',', '')
+        if value.isdigit():
+            filters[name] = int(value)
+    currency = params.get('currency', '').upper()
+    if currency in CURRENCIES:
+        filters['currency'] = currency
+    elif 'min_salary' in filters or 'max_salary' in filters or params.get('sort') in ('salary_high', 'salary_low'):
+        # Salaries only compare within one currency
+        filters['currency'] = DEFAULT_CURRENCY
+    return filters
+
+
+def selected_sort(params):
+    sort = params.get('sort')
+    return sort if sort in SORTS else None
+
+
+def posted_since(value, now=None):
+    days = next(days for bucket, _, days in AGE_BUCKETS if bucket == value)
+    return (now or timezone.now()) - timedelta(days=days)
+
+
+def filter_jobs(jobs, filters, exclude=None):
+    """
+    Apply ``filters`` to ``jobs``, except the one named ``exclude``. Each
+    filter is an equality or range on the leading column of an index, so
+    filtered listings stay index walks.
+    """
+    if 'job_type' in filters and exclude != 'job_type':
+        jobs = jobs.filter(job_type=filters['job_type'])
+    if 'location' in filters and exclude != 'location':
+        jobs = jobs.filter(location_key=filters['location'])
+    if 'posted' in filters and exclude != 'posted':
+        jobs = jobs.filter(created_at__gte=posted_since(filters['posted']))
+    if 'remote' in filters:
+        jobs = jobs.filter(is_remote=True)
+    if 'near' in filters:
+        jobs = within_radius(jobs, gazetteer()[0][filters['near']], filters['radius'])
+    if 'currency' in filters:
+        jobs = jobs.filter(salary_currency=filters['currency'])
+    # Ranges that overlap the requested one
+    if 'min_salary' in filters:
+        jobs = jobs.filter(salary_max__gte=filters['min_salary'])
+    if 'max_salary' in filters:
+        jobs = jobs.filter(salary_min__lte=filters['max_salary'])
+    return jobs
+
+
+def _count_facets(jobs, filters):
+    now = timezone.now()
+    by_type = (
+        filter_jobs(jobs, filters, exclude='job_type')
+        .order_by().values_list('job_type').annotate(total=Count('pk'))
+    )
+    by_location = (
+        filter_jobs(jobs, filters, exclude='location').exclude(location_key='')
+        .order_by().values_list('location_key').annotate(total=Count('pk'))
+        .order_by('-total', 'location_key')[:LOCATION_FACET_SIZE]
+    )
+    # The age buckets overlap, so they are conditional counts over one scan
+    by_age = filter_jobs(jobs, filters, exclude='posted').aggregate(**{
+        value: Count('pk', filter=Q(created_at__gte=posted_since(value, now)))
+        for value, _, _ in AGE_BUCKETS
+    })
+    return {'job_type': dict(by_type), 'location': list(by_location), 'posted': by_age}
+
+
+def facet_counts(jobs, filters, key):
+    """
+    ``{facet: counts}`` for ``jobs`` under ``filters``, cached until the next
+    Job write. ``key`` identifies anything else applied to ``jobs`` (the
+    search query).
+    """
+    cache_key = versioned_key('facets', key, sorted(filters.items()))
+    counts = cache.get(cache_key)
+    if counts is None:
+        counts = _count_facets(jobs, filters)
+        cache.set(cache_key, counts, settings.JOB_COUNT_CACHE_TIMEOUT)
+    return counts
+
+
+def matching_count(counts, filters):
+    """Jobs matching every filter, read off the job type facet: every job has exactly one type."""
+    if 'job_type' in filters:
+        return counts['job_type'].get(filters['job_type'], 0)
+    return sum(counts['job_type'].values())
+
+
+def facet_options(counts, filters, params, total_count):
+    """
+    Template-ready facets, in display order. Each option has its value,
+    label, count, whether it is selected and the query string that toggles
+    it (keeping the other parameters, back on the first page).
+    """
+    def option(name, value, label, count):
+        query = params.copy()
+        for param in ('page', 'cursor', name):
+            query.pop(param, None)
+        selected = filters.get(name) == value
+        if not selected:
+            query[name] = value
+        return {'value': value, 'label': label, 'count': count, 'selected': selected, 'query': query.urlencode()}
+
+    locations = counts['location']
+    if 'location' in filters and filters['location'] not in dict(locations):
+        # Outside the top locations; with every filter applied its count is the total
+        locations = locations + [(filters['location'], total_count)]
+    return [
+        {'name': 'job_type', 'heading': 'Job type', 'options': [
+            option('job_type', value, label, counts['job_type'].get(value, 0))
+            for value, label in Job.JOB_TYPE_CHOICES
+        ]},
+        {'name': 'location', 'heading': 'Location', 'options': [
+            option('location', key, location_label(key), count) for key, count in locations
+        ]},
+        {'name': 'posted', 'heading': 'Posted', 'options': [
+            option('posted', value, label, counts['posted'][value]) for value, label, _ in AGE_BUCKETS
+        ]},
+    ]
@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 from django.contrib.auth.forms import UserCreationForm
 from .models import User, Job, Application
 import os
@@ -93,6 +94,15 @@ class ApplicationForm(forms.ModelForm):
             })
         }
     
+    def __init__(self, *args, rejected_uploads=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        # The upload handler stops reading files that are too big, so they
+        # arrive missing; say why instead of "This field is required."
+        if 'resume' in rejected_uploads:
+            self.fields['resume'].error_messages['required'] = (
+                'File size exceeds the 5MB limit. Please upload a smaller file.'
+            )
+
     def clean_resume(self):
         resume = self.cleaned_data.get('resume')
         if resume:
@@ -105,8 +115,7 @@ class ApplicationForm(forms.ModelForm):
                 )
             
             # Validate file size (5MB limit)
-            max_size = 5 * 1024 * 1024  # 5MB
-            if resume.size > max_size:
+            if resume.size > settings.RESUME_MAX_UPLOAD_SIZE:
                 raise forms.ValidationError(
                     'File size exceeds the 5MB limit. Please upload a smaller file.'
                 )
@@ -0,0 +1,130 @@
+"""
+Canonical locations from the free-text ``Job.location`` field.
+
+Places are matched against a small offline gazetteer (jobs/data/gazetteer.csv:
+city, region, country, coordinates and aliases such as "Chittagong" or
+"Gulshan"). Job.save() stores the result, so location filters compare a
+canonical key and proximity searches are coordinate range lookups.
+"""
+import csv
+import math
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from django.db.models import F
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'gazetteer.csv'
+REMOTE_KEY = 'remote'
+REMOTE_RE = re.compile(r'\b(remote|work from home|wfh|anywhere)\b')
+SEPARATORS_RE = re.compile(r'[,;/|()\[\]–—]|\s-\s')
+# Longest alias in the gazetteer, in words
+MAX_ALIAS_WORDS = 3
+KM_PER_DEGREE = 111.32
+
+
+class Place(NamedTuple):
+    key: str
+    city: str
+    region: str
+    country: str
+    latitude: float
+    longitude: float
+
+
+def _fold(text):
+    return ' '.join(text.split()).casefold()
+
+
+@lru_cache(maxsize=None)
+def gazetteer():
+    """``({key: Place}, {alias: Place})``, read once per process."""
+    places, aliases = {}, {}
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            place = Place(
+                _fold(row['city']), row['city'], row['region'], row['country'],
+                float(row['latitude']), float(row['longitude']),
+            )
+            places[place.key] = place
+            for alias in [place.key, *row['aliases'].split('|')]:
+                if alias:
+                    aliases[_fold(alias)] = place
+    return places, aliases
+
+
+def resolve_location(text):
+    """The first gazetteer place named in ``text``, or None."""
+    _, aliases = gazetteer()
+    for part in SEPARATORS_RE.split(_fold(text)):
+        words = part.split()
+        for start in range(len(words)):
+            # Longest match first: "new york city" before "new york"
+            for size in range(min(MAX_ALIAS_WORDS, len(words) - start), 0, -1):
+                place = aliases.get(' '.join(words[start:start + size]))
+                if place:
+                    return place
+    return None
+
+
+def is_remote(text):
+    return bool(REMOTE_RE.search(_fold(text)))
+
+
+def normalize_location(location):
+    """
+    Grouping key for a free-text location: the canonical city when the
+    gazetteer knows it ("Chittagong, BD" -> "chattogram"), "remote" for
+    remote jobs without one, and otherwise the first comma-separated part,
+    whitespace- and case-folded.
+    """
+    place = resolve_location(location)
+    if place:
+        return place.key
+    if is_remote(location):
+        return REMOTE_KEY
+    return _fold(location).split(',')[0].strip()[:100]
+
+
+def location_fields(location):
+    """Values for the Job columns derived from ``location``."""
+    place = resolve_location(location)
+    return {
+        'location_key': normalize_location(location),
+        'location_region': place.region if place else '',
+        'location_country': place.country if place else '',
+        'latitude': place.latitude if place else None,
+        'longitude': place.longitude if place else None,
+        'is_remote': is_remote(location),
+    }
+
+
+def location_label(key):
+    place = gazetteer()[0].get(key)
+    return place.city if place else key.title()
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """``(min_lat, max_lat, min_lon, max_lon)`` around a point."""
+    delta_lat = radius_km / KM_PER_DEGREE
+    delta_lon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - delta_lat, latitude + delta_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def within_radius(jobs, place, radius_km):
+    """
+    ``jobs`` located within ``radius_km`` of ``place``. The bounding box is a
+    range scan on the coordinate index; the circle inside it is checked with
+    an equirectangular distance, plain arithmetic that every backend runs
+    and accurate to well under 1% at these distances.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(place.latitude, place.longitude, radius_km)
+    scale = math.cos(math.radians(place.latitude))
+    dx = (F('longitude') - place.longitude) * scale
+    dy = F('latitude') - place.latitude
+    return jobs.filter(
+        latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon),
+    ).alias(
+        degrees_squared=dx * dx + dy * dy,
+    ).filter(degrees_squared__lte=(radius_km / KM_PER_DEGREE) ** 2)
@@ -0,0 +1,151 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Application, Job, User
+from jobs.performance import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        'Drive every main route through the test client against the configured '
+        'database (e.g. after generate_fake_data) and report latency percentiles '
+        'and query counts. Results can be saved as JSON and compared with an '
+        'earlier run. The status-update scenario writes (it toggles one application).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--iterations', type=int, default=30, help='Measured requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every request.')
+        parser.add_argument('--scenario', action='append', dest='scenarios', help='Only run these scenarios.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--compare', help='A JSON file from an earlier run to diff against.')
+        parser.add_argument('--host', default='localhost', help='Host header; must be in ALLOWED_HOSTS.')
+
+    def scenarios(self):
+        """(name, user, method, url, data) for every route worth timing."""
+        # The busiest job gives the heaviest manage_applications page
+        job = Job.objects.select_related('posted_by').order_by('-application_count', 'pk').first()
+        application = Application.objects.select_related('applicant').filter(job=job).order_by('pk').first()
+        if application is None:
+            raise CommandError('Needs jobs with applications; run generate_fake_data first.')
+        employer, applicant = job.posted_by, application.applicant
+        deep_page = max(Job.objects.count() // 6 // 2, 1)
+
+        return [
+            ('job_list', None, 'get', reverse('job_list'), {}),
+            ('job_list_deep_page', None, 'get', reverse('job_list'), {'page': deep_page}),
+            ('job_list_cursor', None, 'get', reverse('job_list'), {'paginate': 'cursor'}),
+            ('job_list_filtered', None, 'get', reverse('job_list'), {'job_type': 'full_time', 'location': 'dhaka'}),
+            ('job_list_salary_sort', None, 'get', reverse('job_list'), {'sort': 'salary_high', 'min_salary': 50000}),
+            ('job_list_near', None, 'get', reverse('job_list'), {'near': 'Dhaka', 'radius': 25}),
+            ('search', None, 'get', reverse('job_list'), {'q': 'python developer'}),
+            ('search_logged_in', applicant, 'get', reverse('job_list'), {'q': 'senior'}),
+            ('job_detail', applicant, 'get', reverse('job_detail', args=[job.pk]), {}),
+            ('applicant_dashboard', applicant, 'get', reverse('dashboard'), {}),
+            ('employer_dashboard', employer, 'get', reverse('dashboard'), {}),
+            ('manage_applications', employer, 'get', reverse('manage_applications', args=[job.pk]), {}),
+            ('update_status', employer, 'post',
+             reverse('update_application_status', args=[application.pk]), {'status': 'approved'}),
+            ('api_search', None, 'get', reverse('api_job_search'), {'q': 'engineer', 'limit': 50}),
+            ('api_suggest', None, 'get', reverse('api_job_suggest'), {'q': 'dev'}),
+        ]
+
+    def handle(self, *args, **options):
+        selected = set(options['scenarios'] or [])
+        results = {}
+        for name, user, method, url, data in self.scenarios():
+            if selected and name not in selected:
+                continue
+            client = Client(HTTP_HOST=options['host'])
+            if user:
+                client.force_login(user)
+            timings, query_counts = [], []
+            for i in range(options['warmup'] + options['iterations']):
+                if name == 'update_status':
+                    # Alternate so every request is a real change
+                    data = {'status': 'approved' if i % 2 else 'pending'}
+                if options['cold']:
+                    cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = getattr(client, method)(url, data)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                    elapsed = (time.perf_counter() - started) * 1000
+                if response.status_code >= 400:
+                    raise CommandError(f'{name}: {method.upper()} {url} returned {response.status_code}')
+                if i >= options['warmup']:
+                    timings.append(elapsed)
+                    query_counts.append(len(queries))
+
+            timings.sort()
+            results[name] = {
+                'p50_ms': round(percentile(timings, 0.5), 2),
+                'p95_ms': round(percentile(timings, 0.95), 2),
+                'p99_ms': round(percentile(timings, 0.99), 2),
+                'mean_ms': round(statistics.fmean(timings), 2),
+                'queries_min': min(query_counts),
+                'queries_max': max(query_counts),
+            }
+            self.stdout.write(
+                f"{name:<22} p50 {results[name]['p50_ms']:>8.2f} ms  p95 {results[name]['p95_ms']:>8.2f} ms  "
+                f"p99 {results[name]['p99_ms']:>8.2f} ms  queries {results[name]['queries_min']}-{results[name]['queries_max']}"
+            )
+
+        run = {'meta': self.meta(options), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(run, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                self.compare(json.load(baseline)['results'], results)
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'timestamp': timezone.now().isoformat(),
+            'commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'jobs': Job.objects.count(),
+            'applications': Application.objects.count(),
+            'users': User.objects.count(),
+            'iterations': options['iterations'],
+            'cold_cache': options['cold'],
+        }
+
+    def compare(self, baseline, results):
+        self.stdout.write(f"\n{'scenario':<22} {'p50 ms':>26} {'p95 ms':>26} {'queries':>8}")
+        for name, current in results.items():
+            before = baseline.get(name)
+            if before is None:
+                self.stdout.write(f'{name:<22} (new)')
+                continue
+            line = f'{name:<22}'
+            for metric in ('p50_ms', 'p95_ms'):
+                change = (current[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0
+                line += f" {f'{before[metric]:.2f} -> {current[metric]:.2f} ({change:+.0f}%)':>26}"
+            queries = current['queries_max'] - before['queries_max']
+            line += f' {queries:>+8d}'
+            style = self.style.WARNING if queries > 0 else (lambda text: text)
+            self.stdout.write(style(line))
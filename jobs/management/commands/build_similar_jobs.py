@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs import similar
+
+
+class Command(BaseCommand):
+    help = 'Precompute the "Similar jobs" shown on job pages from TF-IDF vectors of every job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Only add jobs posted since the last build, keeping its vocabulary.',
+        )
+        parser.add_argument('--top-k', type=int, default=similar.TOP_K, help='Neighbours kept per job.')
+        parser.add_argument('--batch-size', type=int, default=similar.BATCH_SIZE, help='Jobs compared per matrix product.')
+
+    def handle(self, *args, **options):
+        model = similar.load_model() if options['incremental'] else None
+        if model is not None:
+            model, added = similar.add_new_jobs(model, options['batch_size'])
+            message = f'Added {added} new jobs; {len(model.job_ids)} in total.'
+        else:
+            if options['incremental']:
+                self.stdout.write(self.style.WARNING('No saved model yet; building one from every job.'))
+            model = similar.build_model(options['top_k'], options['batch_size'])
+            message = f'Vectorized {len(model.job_ids)} jobs over {len(model.terms)} terms.'
+        similar.save_model(model)
+        self.stdout.write(self.style.SUCCESS(f'{message} Saved to {settings.SIMILAR_JOBS_PATH}.'))
@@ -0,0 +1,190 @@
+import random
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from jobs.cache import bump_listing_version
+from jobs.models import Application, Job, User
+from jobs.search import rebuild_index
+
+TITLES = [
+    'Backend Developer', 'Frontend Developer', 'Full Stack Engineer', 'Data Analyst', 'Data Scientist',
+    'DevOps Engineer', 'Site Reliability Engineer', 'QA Engineer', 'Mobile Developer', 'Product Manager',
+    'UX Designer', 'Graphic Designer', 'Technical Writer', 'Sales Executive', 'Account Manager',
+    'HR Officer', 'Accountant', 'Customer Support Agent', 'Marketing Specialist', 'Machine Learning Engineer',
+]
+SENIORITY = ['', '', 'Junior ', 'Senior ', 'Lead ', 'Principal ']
+STACKS = ['Python', 'Django', 'React', 'Go', 'Java', 'Kotlin', 'PostgreSQL', 'AWS', 'Kubernetes', 'TypeScript']
+COMPANIES = [
+    'Acme Ltd', 'Brain Station 23', 'Pathao', 'bKash', 'Grameenphone', 'Shohoz', 'Chaldal', 'Therap',
+    'Globex', 'Initech', 'Umbrella Corp', 'Hooli', 'Stark Industries', 'Wayne Enterprises', 'Cyberdyne',
+]
+LOCATIONS = [
+    'Dhaka, Bangladesh', 'Chattogram, Bangladesh', 'Sylhet, Bangladesh', 'Khulna, Bangladesh',
+    'Rajshahi, Bangladesh', 'Gulshan, Dhaka', 'Banani, Dhaka', 'Kolkata, India', 'Bengaluru, India',
+    'Singapore', 'Kuala Lumpur, Malaysia', 'London, UK', 'Berlin, Germany', 'Toronto, Canada',
+    'New York, NY', 'San Francisco, CA', 'Remote', 'Remote (Asia)', 'Hybrid - Dhaka',
+]
+# Free text, the way employers type it
+SALARIES = [
+    '', 'Negotiable', '30000-50000 BDT', '50,000 - 80,000 BDT/month', 'BDT 1,20,000 per month',
+    '৳40k-60k', '$60k - $80k', '$90,000 - $120,000 per year', 'USD 45/hour', '€45,000 - €55,000 annually',
+    '£35,000', 'Up to 100000 BDT', 'From 25000 BDT monthly', '70k', '1.2 lakh BDT/month',
+]
+WORDS = (
+    'build maintain scalable reliable services team customers product features design review code '
+    'deploy monitor improve performance collaborate stakeholders deliver quality data pipelines '
+    'testing automation cloud infrastructure security mentor ownership roadmap analytics'
+).split()
+
+
+def sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def paragraph(rng, sentences=4):
+    return ' '.join(sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+
+@contextmanager
+def explicit_timestamps(model, *names):
+    """Let bulk_create keep the given auto_now/auto_now_add values instead of overwriting them with now()."""
+    fields = [model._meta.get_field(name) for name in names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-generate realistic users, jobs and applications for load testing, e.g. '
+        '--users 100000 --jobs 1000000 --applications 10000000. Never run it against production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--employer-ratio', type=float, default=0.05, help='Share of users who are employers.')
+        parser.add_argument('--jobs', type=int, default=10000)
+        parser.add_argument('--applications', type=int, default=50000)
+        parser.add_argument('--days', type=int, default=365, help='Spread posting dates over this many days.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42, help='Same seed, same data.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        now = timezone.now()
+        started = time.monotonic()
+
+        employers, applicants = self.create_users(rng, options['users'], options['employer_ratio'])
+        job_ids = self.create_jobs(rng, options['jobs'], employers, now, options['days'])
+        self.create_applications(rng, options['applications'], job_ids, applicants, now)
+
+        # bulk_create skips save() and signals: recount, reindex and invalidate once at the end
+        self.stdout.write('Recounting application counters...')
+        Job.objects.recount_application_counters()
+        self.stdout.write('Rebuilding the search index...')
+        rebuild_index()
+        bump_listing_version()
+        self.stdout.write(self.style.SUCCESS(f'Done in {time.monotonic() - started:.0f}s.'))
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def report(self, label, done, total):
+        self.stdout.write(f'\r{label}: {done}/{total}', ending='')
+        if done >= total:
+            self.stdout.write('')
+
+    def create_users(self, rng, total, employer_ratio):
+        # Hashing is deliberately slow; every fake user shares one hash of "password"
+        password = make_password('password')
+        offset = User.objects.count()
+        employers, applicants = array('q'), array('q')
+        for start, size in self.batches(total):
+            users = []
+            for n in range(offset + start, offset + start + size):
+                is_employer = rng.random() < employer_ratio
+                users.append(User(
+                    username=f'fake{n:07d}', email=f'fake{n:07d}@example.com', password=password,
+                    is_employer=is_employer, is_applicant=not is_employer,
+                ))
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+            # Primary keys are not returned on every backend; read them back by username
+            created = User.objects.filter(username__in=[user.username for user in users])
+            for pk, is_employer in created.values_list('pk', 'is_employer'):
+                (employers if is_employer else applicants).append(pk)
+            self.report('Users', start + size, total)
+        if not employers and total:
+            employers.append(applicants.pop())
+        return employers, applicants
+
+    def create_jobs(self, rng, total, employers, now, days):
+        job_ids = array('q')
+        if not employers:
+            return job_ids
+        for start, size in self.batches(total):
+            jobs = []
+            for _ in range(size):
+                created_at = now - timedelta(seconds=rng.randint(0, days * 86400))
+                title = f'{rng.choice(SENIORITY)}{rng.choice(TITLES)}'
+                if rng.random() < 0.4:
+                    title += f' ({rng.choice(STACKS)})'
+                job = Job(
+                    title=title,
+                    company_name=rng.choice(COMPANIES),
+                    location=rng.choice(LOCATIONS),
+                    job_type=rng.choice(Job.JOB_TYPE_CHOICES)[0],
+                    salary=rng.choice(SALARIES),
+                    description=paragraph(rng, rng.randint(3, 8)),
+                    requirements='\n'.join(sentence(rng, 8) for _ in range(rng.randint(2, 6))),
+                    benefits=sentence(rng, 10) if rng.random() < 0.6 else '',
+                    posted_by_id=rng.choice(employers),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+                job.set_derived_fields()
+                jobs.append(job)
+            with transaction.atomic(), explicit_timestamps(Job, 'created_at', 'updated_at'):
+                created = Job.objects.bulk_create(jobs)
+            if created and created[0].pk is None:
+                created = Job.objects.order_by('-pk').values_list('pk', flat=True)[:size]
+                job_ids.extend(created)
+            else:
+                job_ids.extend(job.pk for job in created)
+            self.report('Jobs', start + size, total)
+        return job_ids
+
+    def create_applications(self, rng, total, job_ids, applicants, now):
+        if not job_ids or not applicants:
+            return
+        statuses = ['pending'] * 6 + ['approved'] * 2 + ['rejected'] * 2
+        for start, size in self.batches(total):
+            applications = [
+                Application(
+                    job_id=rng.choice(job_ids),
+                    applicant_id=rng.choice(applicants),
+                    resume='resumes/sample.pdf',
+                    cover_letter=paragraph(rng, 2),
+                    status=rng.choice(statuses),
+                    applied_at=now - timedelta(seconds=rng.randint(0, 90 * 86400)),
+                )
+                for _ in range(size)
+            ]
+            # A repeated (job, applicant) pair is dropped by the unique constraint
+            with transaction.atomic(), explicit_timestamps(Application, 'applied_at'):
+                Application.objects.bulk_create(applications, ignore_conflicts=True)
+            self.report('Applications', start + size, total)
@@ -0,0 +1,58 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from jobs.performance import percentile
+
+DEFAULT_PATHS = ['/', '/jobs/?q=developer', '/jobs/?paginate=cursor', '/jobs/?page=2']
+
+
+class Command(BaseCommand):
+    help = (
+        'Fire concurrent HTTP requests at one or more running servers and compare '
+        'throughput and latency, e.g. gunicorn (WSGI) against uvicorn workers (ASGI).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='+', help='Base URLs, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable).')
+        parser.add_argument('-n', '--requests', type=int, default=1000, help='Requests per target.')
+        parser.add_argument('-c', '--concurrency', type=int, default=16)
+        parser.add_argument('--cookie', default='', help='Cookie header to send, e.g. "sessionid=..." for the dashboards.')
+
+    def fetch(self, url, cookie):
+        request = urllib.request.Request(url, headers={'Cookie': cookie} if cookie else {})
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                ok = response.status < 400
+        except (urllib.error.URLError, OSError):
+            ok = False
+        return time.perf_counter() - started, ok
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        for target in options['targets']:
+            urls = [target.rstrip('/') + paths[i % len(paths)] for i in range(options['requests'])]
+            # One warm-up pass fills the caches so every target starts equal
+            for url in set(urls):
+                self.fetch(url, options['cookie'])
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(options['concurrency']) as pool:
+                results = list(pool.map(lambda url: self.fetch(url, options['cookie']), urls))
+            elapsed = time.perf_counter() - started
+
+            timings = sorted(timing * 1000 for timing, _ in results)
+            errors = sum(1 for _, ok in results if not ok)
+            self.stdout.write(
+                f'{target}: {len(results) / elapsed:.1f} req/s, '
+                f'p50 {percentile(timings, 0.5):.1f} ms, p95 {percentile(timings, 0.95):.1f} ms, '
+                f'p99 {percentile(timings, 0.99):.1f} ms, mean {statistics.fmean(timings):.1f} ms, '
+                f'{errors} errors'
+            )
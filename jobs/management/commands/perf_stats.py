@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from jobs.performance import METRICS, published_snapshots, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Print p50/p95/p99 wall time, query count, DB time, template time and '
+        'response size per URL name, merged from every process that published '
+        'its request metrics to the (shared) cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print the raw summary as JSON.')
+        parser.add_argument('--sort', choices=METRICS, default='wall_ms', help='Sort by this metric\'s p95.')
+
+    def handle(self, *args, **options):
+        summary = summarize(*published_snapshots())
+        if options['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        if not summary:
+            self.stdout.write('No request metrics published yet (a per-process cache such as locmem is not shared).')
+            return
+
+        header = f"{'url name':<32} {'requests':>8}" + ''.join(f' {metric + " p50/p95/p99":>28}' for metric in METRICS)
+        self.stdout.write(header)
+        for name, route in sorted(summary.items(), key=lambda item: -item[1][options['sort']]['p95']):
+            row = f"{name:<32} {route['requests']:>8}"
+            for metric in METRICS:
+                values = route[metric]
+                row += f" {values['p50']:>8g} {values['p95']:>9g} {values['p99']:>9g}"
+            self.stdout.write(row)
+            if route['n_plus_one_requests']:
+                self.stdout.write(self.style.WARNING(
+                    f"  {route['n_plus_one_requests']} request(s) with repeated queries, e.g. {route['last_n_plus_one']}"
+                ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jobs import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index used by the job listing search.'
+
+    def handle(self, *args, **options):
+        if not search.uses_index():
+            self.stdout.write(self.style.WARNING(
+                'This database backend has no search index; searches use a substring scan.'
+            ))
+            return
+        count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} jobs.'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+
+COUNTER_FIELDS = Job.COUNTER_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Recount applications per job and repair any drift in the stored counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        checked = repaired = 0
+        while True:
+            # Walk jobs by primary key, recounting each batch with one grouped query
+            batch = list(
+                Job.objects.filter(pk__gt=last_pk).order_by('pk')
+                .only('pk', *COUNTER_FIELDS).with_application_counts()[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            checked += len(batch)
+
+            drifted = [
+                job.pk for job in batch
+                if any(getattr(job, field) != getattr(job, 'counted_' + field) for field in COUNTER_FIELDS)
+            ]
+            repaired += len(drifted)
+            if drifted and not options['dry_run']:
+                # Recount inside the UPDATE itself so concurrent writes are not lost
+                Job.objects.filter(pk__in=drifted).recount_application_counters()
+
+        action = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} jobs. {action} {repaired} with drifted counters.'))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.notifications import send_pending_notifications
+
+
+class Command(BaseCommand):
+    help = 'Email applicants about queued application status changes, one digest per applicant.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=5, help='Give up on a change after this many failures.')
+        parser.add_argument('--watch', action='store_true', help='Keep polling the outbox instead of exiting when it is empty.')
+        parser.add_argument('--interval', type=float, default=10, help='Seconds between polls with --watch.')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_pending_notifications(options['batch_size'], options['max_attempts'])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                # Failed rows are rescheduled into the future, so the next batch is new work
+                continue
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Notified {total_sent} status changes. {total_failed} failed and will be retried.'
+        ))
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE jobs_job_fts USING fts5("
+            "title, company_name, location, description, requirements, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        # Default ranking: bm25 with title weighted highest
+        schema_editor.execute(
+            "INSERT INTO jobs_job_fts (jobs_job_fts, rank) "
+            "VALUES ('rank', 'bm25(10.0, 5.0, 5.0, 1.0, 1.0)')"
+        )
+        schema_editor.execute(
+            "INSERT INTO jobs_job_fts (rowid, title, company_name, location, description, requirements) "
+            "SELECT id, title, company_name, location, description, requirements FROM jobs_job"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX jobs_job_search_idx ON jobs_job USING GIN (("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(company_name, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+            "setweight(to_tsvector('english', coalesce(requirements, '')), 'D')))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS jobs_job_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS jobs_job_search_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_benefits_job_job_type_job_requirements_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
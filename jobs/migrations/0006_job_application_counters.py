@@ -0,0 +1,55 @@
+# Generated by Django 4.2.4 on 2026-10-18 04:59
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('jobs', 'Application')
+
+    def count(**filters):
+        counted = (
+            Application.objects.filter(job=OuterRef('pk'), **filters)
+            .order_by().values('job').annotate(total=Count('pk')).values('total')
+        )
+        return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+    Job.objects.update(
+        application_count=count(),
+        pending_count=count(status='pending'),
+        approved_count=count(status='approved'),
+        rejected_count=count(status='rejected'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='approved_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:00
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    # Keep the earliest application per (job, applicant) so the unique
+    # constraint below can be created, then recount the affected jobs
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('jobs', 'Application')
+    duplicates = (
+        Application.objects.values('job', 'applicant')
+        .annotate(first_id=Min('id'), total=Count('id')).filter(total__gt=1)
+    )
+    job_ids = set()
+    for row in duplicates:
+        Application.objects.filter(job=row['job'], applicant=row['applicant']).exclude(id=row['first_id']).delete()
+        job_ids.add(row['job'])
+    if not job_ids:
+        return
+
+    def count(**filters):
+        counted = (
+            Application.objects.filter(job=OuterRef('pk'), **filters)
+            .order_by().values('job').annotate(total=Count('pk')).values('total')
+        )
+        return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+    Job.objects.filter(id__in=job_ids).update(
+        application_count=count(),
+        pending_count=count(status='pending'),
+        approved_count=count(status='approved'),
+        rejected_count=count(status='rejected'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_application_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', 'applied_at'], name='application_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'status'], name='application_applicant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-created_at', '-id'], name='job_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_by', '-created_at'], name='job_poster_recent_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('job', 'applicant'), name='unique_job_applicant'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:13
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_application_status_change'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationstatuschange',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='applicationstatuschange',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='applicationstatuschange',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='applicationstatuschange',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='applicationstatuschange',
+            index=models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['next_attempt_at'], name='status_change_outbox_idx'),
+        ),
+    ]
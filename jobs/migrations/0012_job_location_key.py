@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+def normalize_location(location):
+    # Frozen copy of jobs.locations.normalize_location
+    folded = ' '.join(location.split()).casefold()
+    if 'remote' in folded:
+        return 'remote'
+    return folded.split(',')[0].strip()[:100]
+
+
+def backfill_location_key(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    # One UPDATE per distinct location rather than one per job
+    locations = list(Job.objects.order_by().values_list('location', flat=True).distinct())
+    for location in locations:
+        Job.objects.filter(location=location).update(location_key=normalize_location(location))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_status_change_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='location_key',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_location_key, migrations.RunPython.noop),
+        # Built after the backfill rather than maintained through it
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['job_type', '-created_at'], name='job_type_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location_key', '-created_at'], name='job_location_recent_idx'),
+        ),
+    ]
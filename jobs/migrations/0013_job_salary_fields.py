@@ -0,0 +1,33 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_location_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='salary_currency',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_period',
+            field=models.CharField(blank=True, choices=[('hour', 'Per hour'), ('day', 'Per day'), ('week', 'Per week'), ('month', 'Per month'), ('year', 'Per year')], editable=False, max_length=5),
+        ),
+    ]
@@ -0,0 +1,113 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 2000
+
+# Frozen copy of jobs.salary as of this migration
+MONTHLY_FACTORS = {
+    'hour': Decimal(40 * 52) / 12,
+    'day': Decimal(5 * 52) / 12,
+    'week': Decimal(52) / 12,
+    'month': Decimal(1),
+    'year': Decimal(1) / 12,
+}
+MAX_AMOUNT = 2**31 - 1
+YEARLY_CURRENCIES = {'USD', 'EUR', 'GBP'}
+CURRENCY_PATTERNS = [
+    ('BDT', r'৳|\bbdt\b|\btk\b|\btaka\b'),
+    ('INR', r'₹|\binr\b|\brs\.?(?=\s|\d)'),
+    ('USD', r'\$|\busd\b'),
+    ('EUR', r'€|\beur\b|\beuros?\b'),
+    ('GBP', r'£|\bgbp\b'),
+]
+PERIOD_PATTERNS = [
+    ('hour', r'\bhour(ly)?\b|\bhr\b|/\s*h\b'),
+    ('day', r'\bday\b|\bdaily\b|/\s*d\b'),
+    ('week', r'\bweek(ly)?\b|\bwk\b'),
+    ('month', r'\bmonth(ly)?\b|\bmo\b|/\s*m\b'),
+    ('year', r'\byear(ly)?\b|\bannum\b|\bannual(ly)?\b|\byr\b|\bp\.?a\.?\b|/\s*y\b'),
+]
+MULTIPLIERS = {'k': 1000, 'lakh': 100000, 'lac': 100000, 'crore': 10000000, 'm': 1000000}
+AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(k|lakh|lac|crore|m)?(?![a-z])', re.IGNORECASE)
+
+
+def _amounts(text):
+    amounts = []
+    for number, unit in AMOUNT_RE.findall(text):
+        try:
+            value = Decimal(number.replace(',', ''))
+        except InvalidOperation:
+            continue
+        amounts.append((value, MULTIPLIERS[unit.lower()] if unit else None))
+        if len(amounts) == 2:
+            break
+    if len(amounts) == 2 and amounts[0][1] is None and amounts[1][1]:
+        amounts[0] = (amounts[0][0], amounts[1][1])
+    return [value * (unit or 1) for value, unit in amounts]
+
+
+def _match(patterns, text, default):
+    for name, pattern in patterns:
+        if re.search(pattern, text):
+            return name
+    return default
+
+
+def parse_salary(text):
+    """``(monthly minimum, monthly maximum, currency, period)``, or None."""
+    text = (text or '').casefold()
+    amounts = [amount for amount in _amounts(text) if amount > 0]
+    if not amounts:
+        return None
+    currency = _match(CURRENCY_PATTERNS, text, 'BDT')
+    period = _match(PERIOD_PATTERNS, text, 'year' if currency in YEARLY_CURRENCIES else 'month')
+    factor = MONTHLY_FACTORS[period]
+    minimum = min(round(min(amounts) * factor), MAX_AMOUNT)
+    maximum = min(round(max(amounts) * factor), MAX_AMOUNT)
+    return minimum, maximum, currency, period
+
+
+def backfill_salaries(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    db = schema_editor.connection.alias
+    # Rows already parsed are skipped, so an interrupted run picks up where it stopped
+    pending = Job.objects.using(db).filter(salary_period='').exclude(salary='').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(pending.filter(pk__gt=last_pk).only('pk', 'salary')[:BATCH_SIZE])
+        if not batch:
+            break
+        parsed_jobs = []
+        for job in batch:
+            parsed = parse_salary(job.salary)
+            if parsed:
+                job.salary_min, job.salary_max, job.salary_currency, job.salary_period = parsed
+                parsed_jobs.append(job)
+        with transaction.atomic(using=db):
+            Job.objects.using(db).bulk_update(
+                parsed_jobs, ['salary_min', 'salary_max', 'salary_currency', 'salary_period'],
+            )
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+    # One short transaction per batch instead of one covering the whole table
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0013_job_salary_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_salaries, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_currency', '-salary_max', '-created_at'], name='job_salary_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_currency', 'salary_min', '-created_at'], name='job_salary_min_idx'),
+        ),
+    ]
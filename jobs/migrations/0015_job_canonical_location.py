@@ -0,0 +1,172 @@
+# Generated by Django 4.2.4 on 2026-10-18 05:33
+
+import csv
+import io
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of jobs.locations and jobs/data/gazetteer.csv as of this migration
+GAZETTEER = '''\
+city,region,country,latitude,longitude,aliases
+Dhaka,Dhaka Division,Bangladesh,23.8103,90.4125,dacca|gulshan|banani|dhanmondi|uttara|mirpur|motijheel|mohakhali|tejgaon|bashundhara|badda
+Chattogram,Chattogram Division,Bangladesh,22.3569,91.7832,chittagong|ctg|agrabad
+Sylhet,Sylhet Division,Bangladesh,24.8949,91.8687,
+Khulna,Khulna Division,Bangladesh,22.8456,89.5403,
+Rajshahi,Rajshahi Division,Bangladesh,24.3745,88.6042,
+Barishal,Barishal Division,Bangladesh,22.7010,90.3535,barisal
+Rangpur,Rangpur Division,Bangladesh,25.7439,89.2752,
+Mymensingh,Mymensingh Division,Bangladesh,24.7471,90.4203,
+Cumilla,Chattogram Division,Bangladesh,23.4607,91.1809,comilla
+Narayanganj,Dhaka Division,Bangladesh,23.6238,90.5000,
+Gazipur,Dhaka Division,Bangladesh,23.9999,90.4203,tongi
+Savar,Dhaka Division,Bangladesh,23.8583,90.2667,ashulia
+Cox's Bazar,Chattogram Division,Bangladesh,21.4272,92.0058,coxs bazar|cox's bazaar
+Bogura,Rajshahi Division,Bangladesh,24.8465,89.3773,bogra
+Jashore,Khulna Division,Bangladesh,23.1664,89.2081,jessore
+Kolkata,West Bengal,India,22.5726,88.3639,calcutta
+Bengaluru,Karnataka,India,12.9716,77.5946,bangalore
+Mumbai,Maharashtra,India,19.0760,72.8777,bombay
+Delhi,Delhi,India,28.6139,77.2090,new delhi
+Chennai,Tamil Nadu,India,13.0827,80.2707,madras
+Hyderabad,Telangana,India,17.3850,78.4867,
+Pune,Maharashtra,India,18.5204,73.8567,
+Kathmandu,Bagmati,Nepal,27.7172,85.3240,
+Colombo,Western Province,Sri Lanka,6.9271,79.8612,
+Karachi,Sindh,Pakistan,24.8607,67.0011,
+Lahore,Punjab,Pakistan,31.5204,74.3587,
+Singapore,Singapore,Singapore,1.3521,103.8198,
+Kuala Lumpur,Kuala Lumpur,Malaysia,3.1390,101.6869,kl
+Bangkok,Bangkok,Thailand,13.7563,100.5018,
+Jakarta,Jakarta,Indonesia,-6.2088,106.8456,
+Tokyo,Tokyo,Japan,35.6762,139.6503,
+Seoul,Seoul,South Korea,37.5665,126.9780,
+Hong Kong,Hong Kong,China,22.3193,114.1694,
+Shanghai,Shanghai,China,31.2304,121.4737,
+Dubai,Dubai,United Arab Emirates,25.2048,55.2708,
+Abu Dhabi,Abu Dhabi,United Arab Emirates,24.4539,54.3773,
+Doha,Doha,Qatar,25.2854,51.5310,
+Riyadh,Riyadh Province,Saudi Arabia,24.7136,46.6753,
+London,England,United Kingdom,51.5074,-0.1278,
+Manchester,England,United Kingdom,53.4808,-2.2426,
+Dublin,Leinster,Ireland,53.3498,-6.2603,
+Berlin,Berlin,Germany,52.5200,13.4050,
+Munich,Bavaria,Germany,48.1351,11.5820,münchen
+Amsterdam,North Holland,Netherlands,52.3676,4.9041,
+Paris,Île-de-France,France,48.8566,2.3522,
+Stockholm,Stockholm County,Sweden,59.3293,18.0686,
+Toronto,Ontario,Canada,43.6532,-79.3832,
+Vancouver,British Columbia,Canada,49.2827,-123.1207,
+New York,New York,United States,40.7128,-74.0060,nyc|new york city|manhattan|brooklyn
+San Francisco,California,United States,37.7749,-122.4194,sf|san francisco bay area
+Seattle,Washington,United States,47.6062,-122.3321,
+Austin,Texas,United States,30.2672,-97.7431,
+Boston,Massachusetts,United States,42.3601,-71.0589,
+Chicago,Illinois,United States,41.8781,-87.6298,
+Los Angeles,California,United States,34.0522,-118.2437,
+Sydney,New South Wales,Australia,-33.8688,151.2093,
+Melbourne,Victoria,Australia,-37.8136,144.9631,
+'''
+REMOTE_RE = re.compile(r'\b(remote|work from home|wfh|anywhere)\b')
+SEPARATORS_RE = re.compile(r'[,;/|()\[\]–—]|\s-\s')
+MAX_ALIAS_WORDS = 3
+
+
+def _fold(text):
+    return ' '.join(text.split()).casefold()
+
+
+def read_aliases():
+    aliases = {}
+    for row in csv.DictReader(io.StringIO(GAZETTEER)):
+        place = {
+            'location_key': _fold(row['city']),
+            'location_region': row['region'],
+            'location_country': row['country'],
+            'latitude': float(row['latitude']),
+            'longitude': float(row['longitude']),
+        }
+        for alias in [place['location_key'], *row['aliases'].split('|')]:
+            if alias:
+                aliases[_fold(alias)] = place
+    return aliases
+
+
+def resolve_location(text, aliases):
+    for part in SEPARATORS_RE.split(_fold(text)):
+        words = part.split()
+        for start in range(len(words)):
+            for size in range(min(MAX_ALIAS_WORDS, len(words) - start), 0, -1):
+                place = aliases.get(' '.join(words[start:start + size]))
+                if place:
+                    return place
+    return None
+
+
+def location_fields(location, aliases):
+    remote = bool(REMOTE_RE.search(_fold(location)))
+    place = resolve_location(location, aliases)
+    if place:
+        return {**place, 'is_remote': remote}
+    return {
+        'location_key': 'remote' if remote else _fold(location).split(',')[0].strip()[:100],
+        'location_region': '',
+        'location_country': '',
+        'latitude': None,
+        'longitude': None,
+        'is_remote': remote,
+    }
+
+
+def canonicalize_locations(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    # One UPDATE per distinct location rather than one per job; location_key
+    # changes from the plain first part to the canonical city
+    aliases = read_aliases()
+    locations = list(Job.objects.order_by().values_list('location', flat=True).distinct())
+    for location in locations:
+        Job.objects.filter(location=location).update(**location_fields(location, aliases))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_backfill_job_salary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='is_remote',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='location_country',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='location_region',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(canonicalize_locations, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['latitude', 'longitude'], name='job_coordinates_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_remote', True)), fields=['-created_at'], name='job_remote_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.4 on 2026-10-18 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_job_canonical_location'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_type_recent_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_location_recent_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_salary_max_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_salary_min_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='job',
+            name='job_remote_recent_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['job_type', '-created_at', '-id'], name='job_type_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location_key', '-created_at', '-id'], name='job_location_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_remote', True)), fields=['-created_at', '-id'], name='job_remote_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_currency', '-salary_max', '-created_at', '-id'], name='job_salary_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_currency', 'salary_min', '-created_at', '-id'], name='job_salary_min_idx'),
+        ),
+    ]
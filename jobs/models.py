@@ -1,6 +1,17 @@
-from django.db import models
+import hashlib
+import os
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest, Substr
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.utils import timezone
+
+from .locations import location_fields
+from .salary import PERIOD_CHOICES, parse_salary
 
 class User(AbstractUser):
     is_employer = models.BooleanField(default=False)
@@ -8,6 +19,71 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+# Denormalized counter on Job for each application status
+STATUS_COUNTER_FIELDS = {
+    'pending': 'pending_count',
+    'approved': 'approved_count',
+    'rejected': 'rejected_count',
+}
+
+
+class JobQuerySet(models.QuerySet):
+    # Columns needed to render a job card; the large text fields stay deferred
+    LISTING_FIELDS = ['id', 'title', 'company_name', 'location', 'job_type', 'salary', 'created_at']
+
+    def for_listing(self, new_days=7):
+        """Slim rows for job cards, with ``summary`` and ``is_new`` computed by the database."""
+        new_since = timezone.now() - timedelta(days=new_days)
+        return self.only(*self.LISTING_FIELDS).annotate(
+            summary=Substr('description', 1, 300),
+            is_new=ExpressionWrapper(Q(created_at__gt=new_since), output_field=BooleanField()),
+        )
+
+    def with_application_counts(self):
+        """
+        Actual total and per-status application counts from one grouped
+        aggregate, annotated as ``counted_<counter field>``. Used to check the
+        stored counters for drift.
+        """
+        counts = {'counted_application_count': Count('applications')}
+        for status, field in STATUS_COUNTER_FIELDS.items():
+            counts['counted_' + field] = Count('applications', filter=Q(applications__status=status))
+        return self.annotate(**counts)
+
+    def adjust_application_counters(self, status_deltas):
+        """
+        Atomically apply ``{status: delta}`` to the stored counters with F()
+        expressions. Counters never drop below zero.
+        """
+        changes = {}
+        deltas = [('application_count', sum(status_deltas.values()))]
+        deltas += [(STATUS_COUNTER_FIELDS[status], delta) for status, delta in status_deltas.items()
+                   if status in STATUS_COUNTER_FIELDS]
+        for field, delta in deltas:
+            if delta > 0:
+                changes[field] = F(field) + delta
+            elif delta < 0:
+                changes[field] = Greatest(F(field) + delta, 0)
+        if changes:
+            self.update(**changes)
+
+    def recount_application_counters(self):
+        """Overwrite the stored counters with a fresh count, in a single UPDATE."""
+        def count(**filters):
+            counted = (
+                Application.objects.filter(job=OuterRef('pk'), **filters)
+                .order_by().values('job').annotate(total=Count('pk')).values('total')
+            )
+            return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+        changes = {'application_count': count()}
+        for status, field in STATUS_COUNTER_FIELDS.items():
+            changes[field] = count(status=status)
+        return self.update(**changes)
+
+
 class Job(models.Model):
     JOB_TYPE_CHOICES = [
         ('full_time', 'Full Time'),
@@ -20,8 +96,22 @@ class Job(models.Model):
     title = models.CharField(max_length=200)
     company_name = models.CharField(max_length=200)
     location = models.CharField(max_length=200)
+    # Canonicalized from location on save(), see jobs/locations.py. location_key
+    # is the canonical city (or "remote"), the grouping key for filters and facets
+    location_key = models.CharField(max_length=100, blank=True, editable=False)
+    location_region = models.CharField(max_length=100, blank=True, editable=False)
+    location_country = models.CharField(max_length=100, blank=True, editable=False)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    is_remote = models.BooleanField(default=False, editable=False)
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES, default='full_time')
     salary = models.CharField(max_length=100, blank=True)
+    # Parsed from salary on save(), see jobs/salary.py. The range is in
+    # monthly amounts whatever period the employer quoted
+    salary_min = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    salary_max = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    salary_currency = models.CharField(max_length=3, blank=True, editable=False)
+    salary_period = models.CharField(max_length=5, choices=PERIOD_CHOICES, blank=True, editable=False)
     description = models.TextField()
     requirements = models.TextField(blank=True)
     benefits = models.TextField(blank=True)
@@ -31,10 +121,171 @@ class Job(models.Model):
         related_name='posted_jobs'
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Validator for conditional GETs; the counters below are written with
+    # update() and deliberately do not touch it
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Kept in step with Application writes, see Application.save() and
+    # signals.update_counters_on_delete; reconcile_application_counters repairs drift
+    application_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_count = models.PositiveIntegerField(default=0, editable=False)
+    approved_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = JobQuerySet.as_manager()
+
+    # Written only with update(), never by save() on an existing row
+    COUNTER_FIELDS = ['application_count', *STATUS_COUNTER_FIELDS.values()]
+
+    # Columns computed from another field by set_derived_fields()
+    DERIVED_FIELDS = {
+        'location': ['location_key', 'location_region', 'location_country', 'latitude', 'longitude', 'is_remote'],
+        'salary': ['salary_min', 'salary_max', 'salary_currency', 'salary_period'],
+    }
+
+    class Meta:
+        indexes = [
+            # Newest-first listing and its keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='job_recent_idx'),
+            # Employer dashboard
+            models.Index(fields=['posted_by', '-created_at'], name='job_poster_recent_idx'),
+            # Filtered listings, newest first
+            models.Index(fields=['job_type', '-created_at', '-id'], name='job_type_recent_idx'),
+            models.Index(fields=['location_key', '-created_at', '-id'], name='job_location_recent_idx'),
+            # Bounding boxes for proximity search
+            models.Index(fields=['latitude', 'longitude'], name='job_coordinates_idx'),
+            # Remote-only listing, newest first
+            models.Index(fields=['-created_at', '-id'], condition=Q(is_remote=True), name='job_remote_recent_idx'),
+            # Salary range filters and sorts, within one currency
+            models.Index(fields=['salary_currency', '-salary_max', '-created_at', '-id'], name='job_salary_max_idx'),
+            models.Index(fields=['salary_currency', 'salary_min', '-created_at', '-id'], name='job_salary_min_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what this row contributes to the typeahead index, see signals.update_suggestions
+        loaded = dict(zip(field_names, values))
+        if {'title', 'company_name', 'location'} <= loaded.keys():
+            instance._suggested_as = (loaded['title'], loaded['company_name'], loaded['location'])
+        return instance
+
+    def set_derived_fields(self):
+        """Fill the columns computed from location and salary. save() calls it; bulk_create callers must."""
+        for name, value in location_fields(self.location).items():
+            setattr(self, name, value)
+        parsed = parse_salary(self.salary)
+        self.salary_min, self.salary_max = parsed.monthly() if parsed else (None, None)
+        self.salary_currency = parsed.currency if parsed else ''
+        self.salary_period = parsed.period if parsed else ''
+
+    def save(self, *args, **kwargs):
+        self.set_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # Never write back the counters this instance loaded: applications
+            # created or deleted since would be lost
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        elif update_fields is not None:
+            derived = [name for field in update_fields for name in self.DERIVED_FIELDS.get(field, [])]
+            kwargs['update_fields'] = {*update_fields, *derived}
+        super().save(*args, **kwargs)
+
+class ResumeBlobManager(models.Manager):
+    def store(self, uploaded_file):
+        """
+        Return the blob holding ``uploaded_file``'s content, writing the file
+        only if these bytes have not been stored before, and take a reference
+        on it. Call inside the transaction that saves the referencing
+        application.
+        """
+        digest = getattr(uploaded_file, 'sha256', None)
+        if digest is None:
+            digest = hashlib.sha256()
+            for chunk in uploaded_file.chunks():
+                digest.update(chunk)
+            digest = digest.hexdigest()
+        extension = os.path.splitext(uploaded_file.name)[1].lower()
+        name = f'resumes/sha256/{digest[:2]}/{digest}{extension}'
+
+        blob = self.select_for_update().filter(sha256=digest).first()
+        if blob is None:
+            try:
+                # A savepoint, so a lost race leaves the caller's transaction usable
+                with transaction.atomic(using=self.db):
+                    blob = self.create(sha256=digest, file=name, size=uploaded_file.size)
+            except IntegrityError:
+                # A concurrent upload of the same bytes created it first
+                blob = self.select_for_update().get(sha256=digest)
+        storage = blob.file.storage
+        if not storage.exists(blob.file.name):
+            uploaded_file.seek(0)
+            # The storage may pick another name when this one is taken
+            blob.file.name = storage.save(blob.file.name, uploaded_file)
+        self.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1, file=blob.file.name)
+        return blob
+
+    def release(self, blob_id):
+        """Drop one reference; the last one deletes the row, then the file once committed."""
+        self.filter(pk=blob_id).update(ref_count=Greatest(F('ref_count') - 1, 0))
+        blob = self.select_for_update().filter(pk=blob_id, ref_count=0).first()
+        if blob is not None:
+            blob.delete()
+            transaction.on_commit(lambda: blob.file.storage.delete(blob.file.name))
+
+
+class ResumeBlob(models.Model):
+    """
+    One stored resume file, addressed by its SHA-256 and shared by every
+    application that uploaded the same bytes.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField()
+    size = models.PositiveBigIntegerField()
+    # Applications pointing at this blob
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ResumeBlobManager()
+
+    def __str__(self):
+        return self.sha256
+
+
+class ApplicationQuerySet(models.QuerySet):
+    def set_status(self, status, changed_by=None):
+        """
+        Move every application in the queryset to ``status`` with one UPDATE,
+        adjust the job counters and record an ApplicationStatusChange for each
+        application whose status actually changed. The matched rows are locked
+        first; returns their primary keys.
+        """
+        with transaction.atomic(using=self.db):
+            rows = list(self.select_for_update(of=('self',)).values_list('pk', 'job_id', 'status'))
+            changed = [(pk, job_id, old_status) for pk, job_id, old_status in rows if old_status != status]
+            if changed:
+                Application.objects.filter(pk__in=[pk for pk, _, _ in changed]).update(status=status)
+                deltas = defaultdict(Counter)
+                for _, job_id, old_status in changed:
+                    deltas[job_id][old_status] -= 1
+                    deltas[job_id][status] += 1
+                for job_id, status_deltas in deltas.items():
+                    Job.objects.filter(pk=job_id).adjust_application_counters(status_deltas)
+                ApplicationStatusChange.objects.bulk_create([
+                    ApplicationStatusChange(
+                        application_id=pk, old_status=old_status, new_status=status, changed_by=changed_by,
+                    )
+                    for pk, _, old_status in changed
+                ])
+        return [pk for pk, _, _ in rows]
+
+
 class Application(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -53,6 +304,14 @@ class Application(models.Model):
         related_name='job_applications'  # Added related_name
     )
     resume = models.FileField(upload_to='resumes/')
+    # Content-addressed copy of the resume; older applications have none
+    resume_blob = models.ForeignKey(
+        ResumeBlob,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name='applications'
+    )
     cover_letter = models.TextField()
     applied_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(
@@ -61,5 +320,78 @@ class Application(models.Model):
         default='pending'
     )
 
+    objects = ApplicationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # manage_applications: one job's applications by status and date (scanned
+            # backwards for its "-status, -applied_at" ordering)
+            models.Index(fields=['job', 'status', 'applied_at'], name='application_job_status_idx'),
+            # Applicant dashboard and its status filter
+            models.Index(fields=['applicant', 'status'], name='application_applicant_idx'),
+        ]
+        constraints = [
+            # One application per applicant and job; also serves the has_applied lookup
+            models.UniqueConstraint(fields=['job', 'applicant'], name='unique_job_applicant'),
+        ]
+
+    def __str__(self):
+        return f"{self.applicant.username}'s application for {self.job.title} (Status: {self.get_status_display()})"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            if self._state.adding:
+                previous = None
+            else:
+                # Which counters the row is in now, locked: the instance may be
+                # stale, e.g. a set_status() ran since it was loaded
+                previous = (
+                    Application.objects.select_for_update().filter(pk=self.pk)
+                    .values_list('job_id', 'status').first()
+                )
+            super().save(*args, **kwargs)
+            current = (self.job_id, self.status)
+            if previous and previous != current and previous[0] == self.job_id:
+                # Status change: move one unit between the status counters
+                Job.objects.filter(pk=self.job_id).adjust_application_counters({previous[1]: -1, self.status: 1})
+                ApplicationStatusChange.objects.create(application=self, old_status=previous[1], new_status=self.status)
+            elif previous != current:
+                if previous:
+                    Job.objects.filter(pk=previous[0]).adjust_application_counters({previous[1]: -1})
+                Job.objects.filter(pk=self.job_id).adjust_application_counters({self.status: 1})
+
+
+class ApplicationStatusChange(models.Model):
+    """
+    One old -> new status transition of an application.
+
+    Also the outbox for applicant notifications: rows are written in the
+    same transaction as the status change and sent later by the
+    send_status_notifications command.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_changes')
+    old_status = models.CharField(max_length=10, choices=Application.STATUS_CHOICES)
+    new_status = models.CharField(max_length=10, choices=Application.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+    changed_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # The worker's queue: unsent rows that are due
+            models.Index(
+                fields=['next_attempt_at'], name='status_change_outbox_idx', condition=Q(notified_at__isnull=True),
+            ),
+        ]
+
     def __str__(self):
-        return f"{self.applicant.username}'s application for {self.job.title} (Status: {self.get_status_display()})"
\ No newline at end of file
+        return f'Application {self.application_id}: {self.old_status} -> {self.new_status}'
@@ -0,0 +1,126 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import ApplicationStatusChange
+
+# Seconds before the first retry; doubled after every failed attempt
+RETRY_BASE_DELAY = 60
+MAX_RETRY_DELAY = 6 * 60 * 60
+# Seconds a worker owns the rows it claimed; rows of a worker that died
+# mid-batch are picked up again after this
+CLAIM_TIMEOUT = 10 * 60
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY))
+
+
+def _digest(changes):
+    """
+    Collapse one applicant's queued changes to a single (application, old,
+    new) per application: pending -> approved -> rejected reads as
+    pending -> rejected, and a change that was undone is dropped.
+    """
+    per_application = {}
+    for change in changes:
+        first = per_application.get(change.application_id, change)
+        per_application[change.application_id] = first
+        first.final_status = change.new_status
+    return [change for change in per_application.values() if change.old_status != change.final_status]
+
+
+def _message(applicant, changes):
+    context = {'applicant': applicant, 'changes': changes}
+    return EmailMessage(
+        subject=render_to_string('jobs/email/status_digest_subject.txt', context).strip(),
+        body=render_to_string('jobs/email/status_digest.txt', context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[applicant.email],
+    )
+
+
+def _claim(batch_size, max_attempts, now):
+    """Lock a batch of due rows and lease it, in a transaction that ends before any mail is sent."""
+    with transaction.atomic():
+        batch = list(
+            ApplicationStatusChange.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(notified_at__isnull=True, next_attempt_at__lte=now, attempts__lt=max_attempts)
+            .select_related('application__job', 'application__applicant')
+            .order_by('next_attempt_at', 'pk')[:batch_size]
+        )
+        # No longer due: other workers skip them until the lease runs out
+        ApplicationStatusChange.objects.filter(pk__in=[change.pk for change in batch]).update(
+            next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT),
+        )
+    return batch
+
+
+def _record_failure(changes, error, now):
+    attempts = max(change.attempts for change in changes) + 1
+    ApplicationStatusChange.objects.filter(pk__in=[change.pk for change in changes]).update(
+        attempts=attempts, next_attempt_at=now + retry_delay(attempts), last_error=error,
+    )
+
+
+def send_pending_notifications(batch_size=100, max_attempts=5, now=None):
+    """
+    Send one batch of queued status changes, one digest email per applicant,
+    over a single mail connection. Returns ``(sent, failed)`` counts of
+    outbox rows.
+
+    The batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED where the
+    database supports it and leased for CLAIM_TIMEOUT seconds, so several
+    workers can drain the outbox at once. Mail is sent outside any
+    transaction: the database write lock is never held across SMTP. Each
+    applicant's result is then recorded with one UPDATE; rows whose email
+    fails are retried with exponential backoff, up to ``max_attempts`` times.
+    """
+    now = now or timezone.now()
+    sent = failed = 0
+    batch = _claim(batch_size, max_attempts, now)
+    if not batch:
+        return sent, failed
+
+    by_applicant = defaultdict(list)
+    for change in sorted(batch, key=lambda change: (change.changed_at, change.pk)):
+        by_applicant[change.application.applicant].append(change)
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        # Mail server unreachable: the whole batch backs off as if every send failed
+        error = f'{type(exc).__name__}: {exc}'
+        for changes in by_applicant.values():
+            _record_failure(changes, error, now)
+        return sent, len(batch)
+    try:
+        for applicant, changes in by_applicant.items():
+            digest = _digest(changes)
+            error = ''
+            if digest and not applicant.email:
+                error = 'Applicant has no email address.'
+            elif digest:
+                try:
+                    connection.send_messages([_message(applicant, digest)])
+                except Exception as exc:
+                    error = f'{type(exc).__name__}: {exc}'
+
+            if not error:
+                ApplicationStatusChange.objects.filter(pk__in=[change.pk for change in changes]).update(
+                    notified_at=now, last_error='',
+                )
+                sent += len(changes)
+            else:
+                _record_failure(changes, error, now)
+                failed += len(changes)
+    finally:
+        connection.close()
+    return sent, failed
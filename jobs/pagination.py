@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_SALT = 'jobs.pagination.cursor'
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Keyset pagination over ``(created_at, id)``, newest first.
+
+    Each page is a range scan that starts right after the last row of the
+    previous one, so page 1000 costs the same as page 1. Cursors are signed
+    tokens; an invalid or tampered cursor falls back to the first page.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def encode_cursor(self, job, direction):
+        return signing.dumps([job.created_at.isoformat(), job.pk, direction], salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        try:
+            created_at, pk, direction = signing.loads(cursor, salt=CURSOR_SALT)
+            return datetime.fromisoformat(created_at), int(pk), direction
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+
+    def page(self, cursor=None):
+        position = self.decode_cursor(cursor) if cursor else None
+        if position is None:
+            return self._forward_page(self.queryset, after_cursor=False)
+        created_at, pk, direction = position
+        if direction == 'prev':
+            return self._backward_page(created_at, pk)
+        older = self.queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        return self._forward_page(older, after_cursor=True)
+
+    def _forward_page(self, queryset, after_cursor):
+        rows = list(queryset.order_by('-created_at', '-pk')[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        next_cursor = self.encode_cursor(rows[-1], 'next') if has_more else None
+        previous_cursor = self.encode_cursor(rows[0], 'prev') if after_cursor and rows else None
+        return CursorPage(rows, next_cursor, previous_cursor)
+
+    def _backward_page(self, created_at, pk):
+        newer = self.queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+        rows = list(newer.order_by('created_at', 'pk')[:self.per_page + 1])
+        if not rows:
+            return self._forward_page(self.queryset, after_cursor=False)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        previous_cursor = self.encode_cursor(rows[0], 'prev') if has_more else None
+        return CursorPage(rows, self.encode_cursor(rows[-1], 'next'), previous_cursor)
@@ -0,0 +1,252 @@
+"""
+Per-request performance metrics.
+
+PerformanceMiddleware records, for every request, the wall time, the number
+and duration of database queries, the template render time and the response
+size, keyed by URL name. Samples are kept in rolling in-process windows and
+periodically published to the cache so the perf_stats command can merge
+every worker's numbers. A query run several times with the same SQL during
+one request is reported as a likely N+1.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+METRICS = ['wall_ms', 'queries', 'db_ms', 'template_ms', 'bytes']
+PROCESSES_KEY = 'perf:processes'
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.statements = Counter()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper (see connection.execute_wrapper) that times
+    every query run while a request is being measured.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+        # Parameters are passed separately, so a loop over rows repeats the same SQL
+        metrics.statements[sql] += 1
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.template_time += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each render for the current request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class RouteStats:
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.requests = 0
+        self.duplicate_requests = 0
+        self.last_duplicate = ''
+
+
+class Registry:
+    """Rolling samples per URL name for this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.last_published = 0.0
+
+    def add(self, name, sample, duplicate):
+        with self.lock:
+            stats = self.routes.get(name)
+            if stats is None:
+                stats = self.routes[name] = RouteStats(settings.PERF_WINDOW)
+            stats.samples.append(sample)
+            stats.requests += 1
+            if duplicate:
+                stats.duplicate_requests += 1
+                stats.last_duplicate = duplicate
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: {
+                    'samples': list(stats.samples),
+                    'requests': stats.requests,
+                    'duplicate_requests': stats.duplicate_requests,
+                    'last_duplicate': stats.last_duplicate,
+                }
+                for name, stats in self.routes.items()
+            }
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+
+    def publish(self, force=False):
+        """Share this process's snapshot through the cache, at most every PERF_PUBLISH_INTERVAL."""
+        now = time.monotonic()
+        if not force and now - self.last_published < settings.PERF_PUBLISH_INTERVAL:
+            return
+        self.last_published = now
+        key = f'perf:snapshot:{socket.gethostname()}:{os.getpid()}'
+        timeout = settings.PERF_PUBLISH_INTERVAL * 6
+        cache.set(key, self.snapshot(), timeout)
+        processes = cache.get(PROCESSES_KEY) or set()
+        if key not in processes:
+            cache.set(PROCESSES_KEY, processes | {key}, None)
+
+
+registry = Registry()
+
+
+def published_snapshots():
+    """Every live process's snapshot from the cache."""
+    keys = cache.get(PROCESSES_KEY) or set()
+    snapshots = cache.get_many(list(keys))
+    # Forget processes whose snapshot expired
+    if set(snapshots) != keys:
+        cache.set(PROCESSES_KEY, set(snapshots), None)
+    return list(snapshots.values())
+
+
+def percentile(values, fraction):
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def summarize(*snapshots):
+    """Merge snapshots and reduce them to p50/p95/p99/max per metric and URL name."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, route in snapshot.items():
+            total = merged.setdefault(name, {'samples': [], 'requests': 0, 'duplicate_requests': 0, 'last_duplicate': ''})
+            total['samples'] += route['samples']
+            total['requests'] += route['requests']
+            total['duplicate_requests'] += route['duplicate_requests']
+            total['last_duplicate'] = route['last_duplicate'] or total['last_duplicate']
+
+    summary = {}
+    for name, route in sorted(merged.items()):
+        if not route['samples']:
+            continue
+        columns = dict(zip(METRICS, (sorted(column) for column in zip(*route['samples']))))
+        summary[name] = {
+            'requests': route['requests'],
+            'n_plus_one_requests': route['duplicate_requests'],
+            'last_n_plus_one': route['last_duplicate'],
+        }
+        for metric, values in columns.items():
+            summary[name][metric] = {
+                'p50': round(percentile(values, 0.5), 2),
+                'p95': round(percentile(values, 0.95), 2),
+                'p99': round(percentile(values, 0.99), 2),
+                'max': round(values[-1], 2),
+            }
+    return summary
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        wall_ms = (time.perf_counter() - metrics.started) * 1000
+        db_ms = metrics.db_time * 1000
+        template_ms = metrics.template_time * 1000
+        if response.streaming:
+            # Only known up front when the view set it (e.g. FileResponse)
+            size = int(response.get('Content-Length', 0))
+        else:
+            size = len(response.content)
+
+        match = request.resolver_match
+        name = (match.view_name if match else None) or 'unresolved'
+        sql, repeats = metrics.statements.most_common(1)[0] if metrics.statements else ('', 0)
+        duplicate = ''
+        if repeats >= settings.PERF_DUPLICATE_QUERY_THRESHOLD:
+            duplicate = sql
+            logger.warning('Possible N+1 query in %s: %d executions of %s', name, repeats, sql)
+
+        registry.add(name, (wall_ms, metrics.queries, db_ms, template_ms, size), duplicate)
+        registry.publish()
+
+        if settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={db_ms:.1f};desc="{metrics.queries} queries"',
+                f'tpl;dur={template_ms:.1f}',
+                f'total;dur={wall_ms:.1f}',
+            ])
+        return response
@@ -0,0 +1,109 @@
+"""
+Read replica routing.
+
+Reads of the models in REPLICA_READ_MODELS (the job listings) go to one of
+DATABASE_REPLICAS during GET/HEAD requests. Everything else, every write
+and every read in a request that writes, goes to the primary (``default``).
+
+Replicas lag behind, so a client that has just written something is pinned
+to the primary for REPLICA_PIN_SECONDS with a cookie: an employer sees their
+new job in the listing, an applicant sees their application, straight away.
+
+For the same time after any job write (see cache.bump_listing_version) every
+request reads from the primary: the first requests after a write fill the
+page, count and job caches under the new listing version, and filling them
+from a replica that has not caught up would serve the old rows to everyone.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+
+PIN_COOKIE = 'primary_pin'
+RECENT_WRITE_KEY = 'replicas:recent-write'
+
+_request_state = ContextVar('replica_routing', default=None)
+
+
+def note_primary_write():
+    """Send every read to the primary until the replicas have had time to catch up."""
+    if settings.DATABASE_REPLICAS:
+        cache.set(RECENT_WRITE_KEY, True, settings.REPLICA_PIN_SECONDS)
+
+
+class RequestState:
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not settings.DATABASE_REPLICAS:
+            return None
+        if state.use_replica and not state.wrote and model._meta.label_lower in settings.REPLICA_READ_MODELS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        # Explicitly, or reads related to a replica-loaded instance would follow it there
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return 'default' if settings.DATABASE_REPLICAS else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def can_use_replica(self, request):
+        return (
+            bool(settings.DATABASE_REPLICAS) and request.method in ('GET', 'HEAD')
+            and PIN_COOKIE not in request.COOKIES
+        )
+
+    def start(self, use_replica):
+        return _request_state.set(RequestState(use_replica))
+
+    def finish(self, request, response):
+        state = _request_state.get()
+        if state.wrote or request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            # Read your own writes until the replicas have caught up
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        use_replica = self.can_use_replica(request) and cache.get(RECENT_WRITE_KEY) is None
+        token = self.start(use_replica)
+        try:
+            return self.finish(request, self.get_response(request))
+        finally:
+            _request_state.reset(token)
+
+    async def __acall__(self, request):
+        use_replica = self.can_use_replica(request) and await cache.aget(RECENT_WRITE_KEY) is None
+        token = self.start(use_replica)
+        try:
+            return self.finish(request, await self.get_response(request))
+        finally:
+            _request_state.reset(token)
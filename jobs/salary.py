@@ -0,0 +1,102 @@
+"""
+Structured pay from the free-text ``Job.salary`` field.
+
+Employers type things like "50,000 - 80,000 BDT/month", "$90k - $120k per
+year" or "1.2 lakh BDT/month". :func:`parse_salary` turns those into a range,
+an ISO currency code and a pay period; Job.save() stores the range as
+monthly amounts so listings can filter and sort on it in SQL.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+from typing import NamedTuple, Optional
+
+DEFAULT_CURRENCY = 'BDT'
+CURRENCIES = ['BDT', 'USD', 'EUR', 'GBP', 'INR']
+
+PERIOD_CHOICES = [
+    ('hour', 'Per hour'),
+    ('day', 'Per day'),
+    ('week', 'Per week'),
+    ('month', 'Per month'),
+    ('year', 'Per year'),
+]
+# Multiplier to a monthly amount (40-hour, 5-day weeks)
+MONTHLY_FACTORS = {
+    'hour': Decimal(40 * 52) / 12,
+    'day': Decimal(5 * 52) / 12,
+    'week': Decimal(52) / 12,
+    'month': Decimal(1),
+    'year': Decimal(1) / 12,
+}
+# Largest value the integer columns hold everywhere
+MAX_AMOUNT = 2**31 - 1
+# Salaries in these currencies are quoted yearly unless they say otherwise
+YEARLY_CURRENCIES = {'USD', 'EUR', 'GBP'}
+
+CURRENCY_PATTERNS = [
+    ('BDT', r'৳|\bbdt\b|\btk\b|\btaka\b'),
+    ('INR', r'₹|\binr\b|\brs\.?(?=\s|\d)'),
+    ('USD', r'\$|\busd\b'),
+    ('EUR', r'€|\beur\b|\beuros?\b'),
+    ('GBP', r'£|\bgbp\b'),
+]
+PERIOD_PATTERNS = [
+    ('hour', r'\bhour(ly)?\b|\bhr\b|/\s*h\b'),
+    ('day', r'\bday\b|\bdaily\b|/\s*d\b'),
+    ('week', r'\bweek(ly)?\b|\bwk\b'),
+    ('month', r'\bmonth(ly)?\b|\bmo\b|/\s*m\b'),
+    ('year', r'\byear(ly)?\b|\bannum\b|\bannual(ly)?\b|\byr\b|\bp\.?a\.?\b|/\s*y\b'),
+]
+MULTIPLIERS = {'k': 1000, 'lakh': 100000, 'lac': 100000, 'crore': 10000000, 'm': 1000000}
+AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*(k|lakh|lac|crore|m)?(?![a-z])', re.IGNORECASE)
+
+
+class Salary(NamedTuple):
+    minimum: Decimal
+    maximum: Decimal
+    currency: str
+    period: str
+
+    def monthly(self):
+        """``(minimum, maximum)`` as whole monthly amounts."""
+        factor = MONTHLY_FACTORS[self.period]
+        return min(round(self.minimum * factor), MAX_AMOUNT), min(round(self.maximum * factor), MAX_AMOUNT)
+
+
+def _amounts(text):
+    amounts = []
+    for number, unit in AMOUNT_RE.findall(text):
+        try:
+            value = Decimal(number.replace(',', ''))
+        except InvalidOperation:
+            continue
+        amounts.append((value, MULTIPLIERS[unit.lower()] if unit else None))
+        if len(amounts) == 2:
+            break
+    if len(amounts) == 2 and amounts[0][1] is None and amounts[1][1]:
+        # "40-60k": the unit of the upper bound applies to both
+        amounts[0] = (amounts[0][0], amounts[1][1])
+    return [value * (unit or 1) for value, unit in amounts]
+
+
+def _match(patterns, text, default):
+    for name, pattern in patterns:
+        if re.search(pattern, text):
+            return name
+    return default
+
+
+def parse_salary(text) -> Optional[Salary]:
+    """
+    The salary range in ``text``, or None when it names no figure
+    ("Negotiable", ""). A single figure ("70k", "Up to 100000") gives
+    ``minimum == maximum``.
+    """
+    text = (text or '').casefold()
+    amounts = [amount for amount in _amounts(text) if amount > 0]
+    if not amounts:
+        return None
+    minimum, maximum = min(amounts), max(amounts)
+    currency = _match(CURRENCY_PATTERNS, text, DEFAULT_CURRENCY)
+    period = _match(PERIOD_PATTERNS, text, 'year' if currency in YEARLY_CURRENCIES else 'month')
+    return Salary(minimum, maximum, currency, period)
@@ -0,0 +1,117 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+# Columns covered by the search index, in the order they are declared in the
+# FTS5 table / tsvector expression created by migration 0005.
+SEARCH_FIELDS = ['title', 'company_name', 'location', 'description', 'requirements']
+
+FTS_TABLE = 'jobs_job_fts'
+
+# Postgres expression the GIN index is built on. Queries have to repeat it
+# verbatim or the planner will not pick the index.
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company_name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(requirements, '')), 'D')"
+)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _terms(query):
+    return TOKEN_RE.findall(query.lower())[:10]
+
+
+def uses_index():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def search_jobs(queryset, query, rank=True):
+    """
+    Restrict a Job queryset to rows matching ``query``.
+
+    Every term must match (as a prefix, so results keep up with the
+    keystroke-driven search box). With ``rank=True`` the queryset is ordered
+    by relevance, most recent first among equal scores.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join('"%s"*' % term for term in terms)
+        if rank:
+            # Joined rather than ranked by a correlated subquery, so MATCH runs
+            # once; bm25() is lower-is-better, with the column weights set on the table
+            table = queryset.model._meta.db_table
+            return queryset.extra(
+                select={'search_rank': f'{FTS_TABLE}.rank'},
+                tables=[FTS_TABLE],
+                where=[f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'],
+                params=[match],
+            ).order_by('search_rank', '-created_at', '-id')
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        )
+
+    if vendor == 'postgresql':
+        tsquery = ' & '.join('%s:*' % term for term in terms)
+        queryset = queryset.filter(RawSQL(
+            f"({PG_DOCUMENT}) @@ to_tsquery('english', %s)", (tsquery,), output_field=BooleanField(),
+        ))
+        if rank:
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f"ts_rank({PG_DOCUMENT}, to_tsquery('english', %s))", (tsquery,), output_field=FloatField(),
+            )).order_by('-search_rank', '-created_at', '-id')
+        return queryset
+
+    # No index available on this backend, fall back to the substring scan
+    condition = Q()
+    for term in terms:
+        condition &= (
+            Q(title__icontains=term) |
+            Q(company_name__icontains=term) |
+            Q(location__icontains=term)
+        )
+    return queryset.filter(condition)
+
+
+def index_job(job, using=DEFAULT_DB_ALIAS):
+    # Postgres indexes an expression over the row itself, nothing to sync
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, {", ".join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s, %s)',
+            [job.pk] + [getattr(job, field) or '' for field in SEARCH_FIELDS],
+        )
+
+
+def unindex_job(job_id, using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+
+
+def rebuild_index():
+    """Repopulate the search index from the jobs table. Returns the row count."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            columns = ', '.join(SEARCH_FIELDS)
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM jobs_job')
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        elif connection.vendor == 'postgresql':
+            cursor.execute('REINDEX INDEX jobs_job_search_idx')
+        cursor.execute('SELECT COUNT(*) FROM jobs_job')
+        return cursor.fetchone()[0]
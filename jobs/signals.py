@@ -0,0 +1,89 @@
+from collections import Counter
+from functools import partial
+
+import django
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import search, suggest
+from .cache import bump_listing_version, record_job_deleted
+from .models import Application, Job, ResumeBlob
+from .performance import install_query_recorder
+from .routers import note_primary_write
+
+
+@receiver(post_save, sender=Job)
+def index_saved_job(sender, instance, using, **kwargs):
+    search.index_job(instance, using)
+    # Pinned to the primary straight away; the new version only once the
+    # write is visible, so no request fills it from uncommitted state
+    note_primary_write()
+    transaction.on_commit(bump_listing_version, using=using)
+
+
+@receiver(post_delete, sender=Job)
+def unindex_deleted_job(sender, instance, using, **kwargs):
+    search.unindex_job(instance.pk, using)
+    note_primary_write()
+    transaction.on_commit(record_job_deleted, using=using)
+    transaction.on_commit(bump_listing_version, using=using)
+
+
+@receiver(post_save, sender=Job)
+def update_suggestions(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_suggested_as', None)
+    current = instance._suggested_as = (instance.title, instance.company_name, instance.location)
+    if not created and previous is None:
+        # What the row contributed before is unknown: rebuild on the next lookup
+        transaction.on_commit(suggest.reset)
+        return
+    delta = Counter(suggest.job_values(*current))
+    if previous:
+        delta.subtract(suggest.job_values(*previous))
+    # Rolled-back writes never reach the index
+    transaction.on_commit(lambda: suggest.apply_delta(delta))
+
+
+@receiver(post_delete, sender=Job)
+def remove_suggestions(sender, instance, **kwargs):
+    values = getattr(instance, '_suggested_as', None) or (instance.title, instance.company_name, instance.location)
+    delta = {value: -1 for value in suggest.job_values(*values)}
+    transaction.on_commit(lambda: suggest.apply_delta(delta))
+
+
+@receiver(post_delete, sender=Application)
+def update_counters_on_delete(sender, instance, **kwargs):
+    # Runs inside the deletion's transaction, for cascades as well
+    Job.objects.filter(pk=instance.job_id).adjust_application_counters({instance.status: -1})
+
+
+@receiver(post_delete, sender=Application)
+def release_resume_blob(sender, instance, **kwargs):
+    if instance.resume_blob_id:
+        ResumeBlob.objects.release(instance.resume_blob_id)
+
+
+def _begin_immediate(connection):
+    connection.cursor().execute('BEGIN IMMEDIATE')
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    if django.VERSION < (5, 1):
+        # atomic() begins its transaction through this hook; Django 5.1+ does
+        # the same with OPTIONS['transaction_mode'] = 'IMMEDIATE'
+        connection._start_transaction_under_autocommit = partial(_begin_immediate, connection)
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    # Every connection, whichever thread opens it, reports to the request being measured
+    install_query_recorder(connection)
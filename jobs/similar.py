@@ -0,0 +1,265 @@
+"""
+"Similar jobs" from TF-IDF vectors of each job's title, description and
+requirements.
+
+``manage.py build_similar_jobs`` turns every job into a row of an
+L2-normalized scipy.sparse CSR matrix, so the cosine similarity of two jobs
+is the dot product of their rows, and finds each job's nearest neighbours a
+batch of rows at a time with one sparse matrix product per batch. The matrix,
+its vocabulary and the neighbour lists are saved together in one .npz file
+(SIMILAR_JOBS_PATH); ``--incremental`` vectorizes only the jobs posted since
+against the saved vocabulary and merges them into the existing lists.
+
+Web processes only read the neighbour lists, once per file generation; the
+job cards shown are cached per job (see cache.cached_similar_jobs).
+"""
+import math
+import os
+import re
+import tempfile
+from array import array
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+from .models import Job
+
+TOP_K = 10
+BATCH_SIZE = 256
+# Upper bound on one batch's dense similarity block (float32 cells)
+MAX_BATCH_CELLS = 2**25
+# Terms in a single job cannot make two jobs similar
+MIN_DOCUMENT_FREQUENCY = 2
+MAX_FEATURES = 100000
+# A title word counts as much as this many mentions in the body
+TITLE_WEIGHT = 3
+MAX_TERM_LENGTH = 30
+# Keeps "c++", "c#", "node.js" and "asp.net" whole
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+STOP_WORDS = frozenset('''
+    a about all also an and any are as at be been but by can do for from has have if in into is it its
+    job jobs may more must of on or our role such that the their them they this to up us we well will with
+    within work you your
+'''.split())
+
+
+class SimilarityModel(NamedTuple):
+    job_ids: np.ndarray
+    # One row per job id, one column per term
+    matrix: sparse.csr_matrix
+    terms: np.ndarray
+    idf: np.ndarray
+    # ``job_ids``-aligned, ``TOP_K`` columns each, best first; 0 pads missing neighbours
+    neighbors: np.ndarray
+    scores: np.ndarray
+
+
+def _tokens(text):
+    return [
+        token for token in TOKEN_RE.findall((text or '').casefold())
+        if 1 < len(token) <= MAX_TERM_LENGTH and token not in STOP_WORDS and not token.isdigit()
+    ]
+
+
+def term_counts(title, description, requirements):
+    counts = Counter(_tokens(description))
+    counts.update(_tokens(requirements))
+    for term in _tokens(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+def _count_matrix(rows, vocabulary, grow):
+    """
+    Job ids and a CSR matrix of sublinear term frequencies for ``rows`` of
+    ``(pk, title, description, requirements)``. Unknown terms get a new column
+    when ``grow``, and are dropped otherwise.
+    """
+    ids, indices, values, indptr = array('q'), array('q'), array('f'), array('q', [0])
+    for pk, title, description, requirements in rows:
+        for term, count in term_counts(title, description, requirements).items():
+            column = vocabulary.get(term)
+            if column is None:
+                if not grow:
+                    continue
+                column = vocabulary[term] = len(vocabulary)
+            indices.append(column)
+            values.append(1 + math.log(count))
+        indptr.append(len(indices))
+        ids.append(pk)
+    matrix = sparse.csr_matrix(
+        (np.frombuffer(values, dtype=np.float32), np.frombuffer(indices, dtype=np.int64),
+         np.frombuffer(indptr, dtype=np.int64)),
+        shape=(len(ids), len(vocabulary)),
+    )
+    return np.frombuffer(ids, dtype=np.int64).copy(), matrix
+
+
+def _weighted(matrix, idf):
+    """``matrix`` scaled by ``idf`` with every row L2-normalized."""
+    matrix = (matrix @ sparse.diags(idf.astype(np.float32))).tocsr()
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1), dtype=np.float32).ravel())
+    norms[norms == 0] = 1
+    return (sparse.diags(1 / norms) @ matrix).tocsr().astype(np.float32)
+
+
+def top_neighbors(queries, query_ids, matrix, job_ids, k=TOP_K, batch_size=BATCH_SIZE):
+    """
+    The ``k`` rows of ``matrix`` most similar to each row of ``queries``, as
+    ``(ids, scores)`` arrays of shape ``(len(queries), k)``, best first. A
+    query's own row (same job id) is skipped, and rows sharing no term with
+    it are not neighbours: missing ones are id 0 with score 0.
+
+    Each batch of queries is one sparse product against the whole matrix,
+    sized so its dense block stays under MAX_BATCH_CELLS.
+    """
+    ids = np.zeros((queries.shape[0], k), dtype=np.int64)
+    scores = np.zeros((queries.shape[0], k), dtype=np.float32)
+    count = matrix.shape[0]
+    if not count or not k:
+        return ids, scores
+    top = min(k, count)
+    step = max(1, min(batch_size, MAX_BATCH_CELLS // count))
+    transposed = matrix.T.tocsr()
+    for start in range(0, queries.shape[0], step):
+        stop = min(start + step, queries.shape[0])
+        similarity = (queries[start:stop] @ transposed).toarray()
+        # job_ids is sorted, so a query's own row is found by bisection
+        batch_ids = query_ids[start:stop]
+        position = np.minimum(np.searchsorted(job_ids, batch_ids), count - 1)
+        own = job_ids[position] == batch_ids
+        similarity[np.flatnonzero(own), position[own]] = 0
+        best = np.argpartition(-similarity, top - 1, axis=1)[:, :top]
+        best_scores = np.take_along_axis(similarity, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        matched = best_scores > 0
+        ids[start:stop, :top] = np.where(matched, job_ids[best], 0)
+        scores[start:stop, :top] = np.where(matched, best_scores, 0)
+    return ids, scores
+
+
+def _merge(ids, scores, more_ids, more_scores):
+    """The best ``ids.shape[1]`` of two neighbour lists per row; ties keep the existing ones first."""
+    ids = np.hstack([ids, more_ids])
+    scores = np.hstack([scores, more_scores])
+    order = np.argsort(-scores, axis=1, kind='stable')[:, :more_ids.shape[1]]
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def _job_rows(jobs):
+    return jobs.order_by('pk').values_list('pk', 'title', 'description', 'requirements').iterator(chunk_size=2000)
+
+
+def build_model(k=TOP_K, batch_size=BATCH_SIZE):
+    """Vectorize every job and find all neighbour lists."""
+    vocabulary = {}
+    job_ids, counts = _count_matrix(_job_rows(Job.objects.all()), vocabulary, grow=True)
+    frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+    columns = np.flatnonzero(frequency >= MIN_DOCUMENT_FREQUENCY)
+    if len(columns) > MAX_FEATURES:
+        # The most widely used terms; ties go to the first seen
+        columns = np.sort(columns[np.argsort(-frequency[columns], kind='stable')[:MAX_FEATURES]])
+    terms = np.array(list(vocabulary), dtype=str)[columns]
+    # Smoothed, as if one more job used every term
+    idf = np.log((1 + len(job_ids)) / (1 + frequency[columns])) + 1
+    matrix = _weighted(counts[:, columns], idf)
+    neighbors, scores = top_neighbors(matrix, job_ids, matrix, job_ids, k, batch_size)
+    return SimilarityModel(job_ids, matrix, terms, idf, neighbors, scores)
+
+
+def add_new_jobs(model, batch_size=BATCH_SIZE):
+    """
+    ``(model, added)``: ``model`` with the jobs posted since it was built.
+
+    They are vectorized with the saved vocabulary and idf, so terms first
+    seen in them are ignored until the next full build. Their own lists come
+    from the whole matrix; the existing lists only need comparing against
+    the new rows, since the scores between existing jobs do not change.
+    Edited and deleted jobs are also left to the next full build (deleted
+    ones are skipped when shown).
+    """
+    last_id = model.job_ids[-1] if len(model.job_ids) else 0
+    vocabulary = {term: column for column, term in enumerate(model.terms)}
+    new_ids, counts = _count_matrix(_job_rows(Job.objects.filter(pk__gt=last_id)), vocabulary, grow=False)
+    if not len(new_ids):
+        return model, 0
+    rows = _weighted(counts, model.idf)
+    job_ids = np.concatenate([model.job_ids, new_ids])
+    matrix = sparse.vstack([model.matrix, rows], format='csr')
+    k = model.neighbors.shape[1]
+    new_neighbors, new_scores = top_neighbors(rows, new_ids, matrix, job_ids, k, batch_size)
+    neighbors, scores = _merge(
+        model.neighbors, model.scores, *top_neighbors(model.matrix, model.job_ids, rows, new_ids, k, batch_size),
+    )
+    return SimilarityModel(
+        job_ids, matrix, model.terms, model.idf,
+        np.vstack([neighbors, new_neighbors]), np.vstack([scores, new_scores]),
+    ), len(new_ids)
+
+
+def save_model(model, path=None):
+    """Write ``model`` next to the old file and swap it in, so readers never see half of it."""
+    path = os.fspath(path or settings.SIMILAR_JOBS_PATH)
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    file, temporary = tempfile.mkstemp(dir=directory, suffix='.npz')
+    try:
+        with os.fdopen(file, 'wb') as output:
+            np.savez(
+                output, job_ids=model.job_ids, data=model.matrix.data, indices=model.matrix.indices,
+                indptr=model.matrix.indptr, shape=np.array(model.matrix.shape), terms=model.terms,
+                idf=model.idf, neighbors=model.neighbors, scores=model.scores,
+            )
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load_model(path=None):
+    """The saved model, or None if there is none yet."""
+    path = path or settings.SIMILAR_JOBS_PATH
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        matrix = sparse.csr_matrix((data['data'], data['indices'], data['indptr']), shape=tuple(data['shape']))
+        return SimilarityModel(
+            data['job_ids'], matrix, data['terms'], data['idf'], data['neighbors'], data['scores'],
+        )
+
+
+# (generation, job_ids, neighbors) of the file last read by this process
+_neighbors = None
+
+
+def model_generation():
+    """Changes whenever the saved model is replaced; None if there is none."""
+    try:
+        stat = os.stat(settings.SIMILAR_JOBS_PATH)
+    except FileNotFoundError:
+        return None
+    # Every save swaps in a new file
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def neighbor_ids(job_id, generation):
+    """Ids of the jobs most similar to ``job_id``, best first; empty for jobs newer than the model."""
+    global _neighbors
+    loaded = _neighbors
+    if loaded is None or loaded[0] != generation:
+        try:
+            with np.load(settings.SIMILAR_JOBS_PATH) as data:
+                # The matrix is not read
+                loaded = _neighbors = (generation, data['job_ids'], data['neighbors'])
+        except FileNotFoundError:
+            return []
+    _, job_ids, neighbors = loaded
+    position = np.searchsorted(job_ids, job_id)
+    if position == len(job_ids) or job_ids[position] != job_id:
+        return []
+    return [int(pk) for pk in neighbors[position] if pk]
@@ -0,0 +1,228 @@
+"""
+Typeahead suggestions for job titles, company names and locations.
+
+Lookups are served from an in-memory prefix index, one per process: a sorted
+list of ``(key, kind, text)`` searched with bisect, where every word of a
+suggestion starts a key ("backend developer" is also found by "dev"), ranked
+by how many jobs use it. Prefixes of up to SHORT_PREFIX_LENGTH characters
+match too much of the index to rank on every keystroke, so their best
+matches are ranked when a snapshot is built; longer prefixes rank their
+whole range, memoized. The index is immutable and replaced as a whole, so
+threads read it without locking; writers build the next snapshot under a lock.
+
+Job writes in this process are applied incrementally once committed (see
+signals.py). Writes in other processes are picked up by rebuilding the index
+from grouped counts once it is SUGGEST_REFRESH_INTERVAL seconds old.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import Count
+
+from .locations import location_label, normalize_location
+from .models import Job
+
+KINDS = ('title', 'company', 'location')
+MAX_RESULTS = 10
+# Prefixes this short have their best matches ranked ahead of time
+SHORT_PREFIX_LENGTH = 3
+# Results remembered per snapshot; visitors type the same prefixes
+MEMO_SIZE = 10000
+# Sorts after every character a prefix can continue with
+HIGHEST = '\U0010ffff'
+
+
+def _fold(text):
+    return ' '.join(text.split()).casefold()
+
+
+def _keys(text):
+    """One key per word start: "senior backend developer", "backend developer", "developer"."""
+    words = _fold(text).split()
+    return {' '.join(words[start:]) for start in range(len(words))}
+
+
+def _short_prefixes(keys):
+    """Every prefix of up to SHORT_PREFIX_LENGTH characters of ``keys``, once each."""
+    heads = {key[:SHORT_PREFIX_LENGTH] for key in keys}
+    return {head[:length] for head in heads for length in range(1, len(head) + 1)}
+
+
+class PrefixIndex:
+    def __init__(self, counts, entries=None, top=None, built_at=None):
+        self.counts = counts
+        # Incremental snapshots keep the age of the build they started from
+        self.built_at = time.monotonic() if built_at is None else built_at
+        if entries is None:
+            keys = {match: _keys(match[1]) for match in counts}
+            entries = sorted((key, *match) for match, match_keys in keys.items() for key in match_keys)
+            top = self._rank_short_prefixes(keys)
+        self.entries = entries
+        # {short prefix: {kind: best matches}}, None standing for any kind
+        self.top = top
+        # Safe to share between threads: a snapshot never changes
+        self.memo = {}
+
+    def _matches(self, prefix):
+        """Every ``(kind, text)`` with a key starting with ``prefix``."""
+        start = bisect_left(self.entries, (prefix,))
+        end = bisect_left(self.entries, (prefix + HIGHEST,))
+        return {(kind, text) for _, kind, text in self.entries[start:end]}
+
+    def _rank(self, match):
+        return -self.counts.get(match, 0), match[1]
+
+    def _ranked(self, matches, kind, limit):
+        if kind is not None:
+            matches = [match for match in matches if match[0] == kind]
+        return heapq.nsmallest(limit, matches, key=self._rank)
+
+    def _rank_matches(self, matches):
+        by_kind = defaultdict(list)
+        for match in matches:
+            by_kind[match[0]].append(match)
+        top = {kind: heapq.nsmallest(MAX_RESULTS, by_kind[kind], key=self._rank) for kind in KINDS}
+        # The best of any kind are among the best of each
+        top[None] = heapq.nsmallest(MAX_RESULTS, [match for kind in KINDS for match in top[kind]], key=self._rank)
+        return top
+
+    def _rank_short_prefixes(self, keys):
+        # Best first, each match fills the lists of its prefixes that have room
+        top, full = {}, set()
+        for match in sorted(keys, key=self._rank):
+            kind = match[0]
+            for prefix in _short_prefixes(keys[match]):
+                if (prefix, kind) in full:
+                    continue
+                ranked = top.get(prefix)
+                if ranked is None:
+                    ranked = top[prefix] = {kind: [] for kind in (None, *KINDS)}
+                for name in (None, kind):
+                    best = ranked[name]
+                    if len(best) < MAX_RESULTS:
+                        best.append(match)
+                if len(ranked[kind]) == MAX_RESULTS and len(ranked[None]) == MAX_RESULTS:
+                    full.add((prefix, kind))
+        return top
+
+    def _rerank(self, prefix, target):
+        """The short prefix's best matches after ``target``'s count changed (already in self.counts)."""
+        top = dict(self.top.get(prefix) or {kind: [] for kind in (None, *KINDS)})
+        for kind in (None, target[0]):
+            best = [match for match in top[kind] if match != target]
+            if target in self.counts:
+                best = sorted([*best, target], key=self._rank)
+            if target in top[kind] and len(top[kind]) == MAX_RESULTS and target not in best[:MAX_RESULTS - 1]:
+                # It dropped to the last place or out: a match outside the list may now rank higher
+                return self._rank_matches(self._matches(prefix))
+            top[kind] = best[:MAX_RESULTS]
+        return top
+
+    def lookup(self, prefix, kind=None, limit=MAX_RESULTS):
+        prefix = _fold(prefix)
+        if not prefix:
+            return []
+        memo_key = (prefix, kind, limit)
+        if memo_key in self.memo:
+            return self.memo[memo_key]
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            best = self.top.get(prefix, {}).get(kind, [])[:limit]
+        else:
+            best = self._ranked(self._matches(prefix), kind, limit)
+        counts = self.counts
+        results = [{'text': text, 'kind': match_kind, 'count': counts[(match_kind, text)]}
+                   for match_kind, text in best]
+        if len(self.memo) < MEMO_SIZE:
+            self.memo[memo_key] = results
+        return results
+
+    def updated(self, delta):
+        """A new index with ``{(kind, text): change}`` applied; this one is left untouched."""
+        counts, entries = dict(self.counts), list(self.entries)
+        for target, change in delta.items():
+            before = counts.get(target, 0)
+            after = before + change
+            if after > 0:
+                counts[target] = after
+            else:
+                counts.pop(target, None)
+            if before <= 0 < after:
+                for key in _keys(target[1]):
+                    insort(entries, (key, *target))
+            elif after <= 0 < before:
+                for key in _keys(target[1]):
+                    entries.pop(bisect_left(entries, (key, *target)))
+        index = PrefixIndex(counts, entries, dict(self.top), self.built_at)
+        # Re-rank the short prefixes the changed suggestions fall under
+        for target in delta:
+            for prefix in _short_prefixes(_keys(target[1])):
+                ranked = index._rerank(prefix, target)
+                if ranked[None]:
+                    index.top[prefix] = ranked
+                else:
+                    index.top.pop(prefix, None)
+        return index
+
+
+def build_index():
+    """A fresh index from one grouped count per kind."""
+    counts = Counter()
+    jobs = Job.objects.order_by()
+    for title, total in jobs.values_list('title').annotate(total=Count('pk')):
+        counts[('title', title.strip())] += total
+    for company, total in jobs.values_list('company_name').annotate(total=Count('pk')):
+        counts[('company', company.strip())] += total
+    for key, total in jobs.exclude(location_key='').values_list('location_key').annotate(total=Count('pk')):
+        counts[('location', location_label(key))] += total
+    counts.pop(('title', ''), None)
+    counts.pop(('company', ''), None)
+    return PrefixIndex(dict(counts))
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    index = _index
+    # Other processes' writes leave no trace here (the listing version may be
+    # per process too), so age alone decides
+    if index is not None and time.monotonic() - index.built_at < settings.SUGGEST_REFRESH_INTERVAL:
+        return index
+    with _lock:
+        # Another thread may have rebuilt it while this one waited
+        if _index is index:
+            _index = build_index()
+        return _index
+
+
+def suggest(prefix, kind=None, limit=MAX_RESULTS):
+    return get_index().lookup(prefix, kind, limit)
+
+
+def reset():
+    global _index
+    with _lock:
+        _index = None
+
+
+def job_values(title, company_name, location):
+    """The ``(kind, text)`` suggestions one job contributes."""
+    values = [('title', title.strip()), ('company', company_name.strip())]
+    key = normalize_location(location)
+    if key:
+        values.append(('location', location_label(key)))
+    return [value for value in values if value[1]]
+
+
+def apply_delta(delta):
+    global _index
+    delta = {target: change for target, change in delta.items() if change}
+    with _lock:
+        if _index is not None and delta:
+            _index = _index.updated(delta)
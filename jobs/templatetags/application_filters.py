@@ -4,4 +4,5 @@ register = template.Library()
 
 @register.filter
 def filter_status(applications, status):
-    return applications.filter(status=status)
+    """Applications with the given status, grouped in memory instead of with a new query"""
+    return [application for application in applications if application.status == status]
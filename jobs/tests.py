@@ -1,3 +1,1585 @@
-from django.test import TestCase
+import asyncio
+import csv
+import importlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.apps import apps
+from django.db import IntegrityError, connection, connections, router, transaction
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, resolve, reverse
+from django.utils import timezone
+import numpy as np
+from scipy import sparse
+
+from jobportal import settings_test
+
+from . import similar, suggest, urls as jobs_urls
+from .cache import listing_version
+from .models import Application, ApplicationStatusChange, Job, ResumeBlob, User
+from .notifications import RETRY_BASE_DELAY, send_pending_notifications
+from .performance import PerformanceMiddleware, registry
+from .locations import is_remote, normalize_location, resolve_location
+from .routers import PIN_COOKIE, RECENT_WRITE_KEY
+from .salary import Salary, parse_salary
+from .pagination import CursorPaginator
+from .search import search_jobs
+
+
+def make_job(employer, **fields):
+    values = {
+        'title': 'Backend Developer',
+        'company_name': 'Acme Ltd',
+        'location': 'Dhaka, Bangladesh',
+        'description': 'Build and run web services.',
+        'posted_by': employer,
+    }
+    values.update(fields)
+    return Job.objects.create(**values)
+
+
+# Also under the default settings, whose cache is shared with running workers
+@override_settings(CACHES=settings_test.CACHES)
+class JobsTestCase(TestCase):
+    def setUp(self):
+        # Counts and pages are cached across requests; start every test cold
+        cache.clear()
+        suggest.reset()
+        # No "Similar jobs" model unless a test builds one
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        similar_path = override_settings(SIMILAR_JOBS_PATH=os.path.join(directory, 'similar_jobs.npz'))
+        similar_path.enable()
+        self.addCleanup(similar_path.disable)
+
+    def use_temp_media(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        return media_root
+
+
+class JobSearchTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+
+    def test_matches_indexed_fields_by_prefix(self):
+        python_job = make_job(self.employer, title='Python Engineer')
+        make_job(self.employer, title='Graphic Designer', requirements='Figma and Photoshop')
+
+        self.assertEqual(list(search_jobs(Job.objects.all(), 'pyth')), [python_job])
+        self.assertEqual(search_jobs(Job.objects.all(), 'photoshop').count(), 1)
+
+    def test_ranks_title_matches_first(self):
+        description_match = make_job(self.employer, title='Data Analyst', description='Some django work.')
+        title_match = make_job(self.employer, title='Django Developer')
+
+        results = list(search_jobs(Job.objects.all(), 'django'))
+        self.assertEqual(results, [title_match, description_match])
+
+    def test_ranked_search_matches_once(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        with CaptureQueriesContext(connection) as queries:
+            list(search_jobs(Job.objects.all(), 'django'))
+        self.assertEqual(queries[0]['sql'].count(' MATCH '), 1)
+
+    def test_index_follows_edits_and_deletes(self):
+        job = make_job(self.employer, title='Rust Engineer')
+        job.title = 'Go Engineer'
+        job.save()
+        self.assertFalse(search_jobs(Job.objects.all(), 'rust').exists())
+        self.assertTrue(search_jobs(Job.objects.all(), 'go').exists())
+
+        job.delete()
+        self.assertFalse(search_jobs(Job.objects.all(), 'go').exists())
+
+    def test_rebuild_command(self):
+        job = make_job(self.employer, title='Kotlin Developer')
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(list(search_jobs(Job.objects.all(), 'kotlin')), [job])
+
+    def test_job_list_search(self):
+        make_job(self.employer, title='Python Engineer')
+        make_job(self.employer, title='Accountant')
+
+        response = self.client.get(reverse('job_list'), {'q': 'python'})
+        self.assertContains(response, 'Python Engineer')
+        self.assertNotContains(response, 'Accountant')
+
+
+class JobListingTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+
+    def test_listing_rows_defer_large_text_fields(self):
+        make_job(self.employer, description='word ' * 1000)
+        job = Job.objects.for_listing().get()
+
+        self.assertTrue({'description', 'requirements', 'benefits'} <= job.get_deferred_fields())
+        self.assertEqual(len(job.summary), 300)
+        self.assertTrue(job.is_new)
+
+    def test_job_list_fetches_a_single_page(self):
+        for i in range(20):
+            make_job(self.employer, title=f'Developer {i:02d}')
+
+        # The Last-Modified lookup, the three facet aggregates (which also
+        # give the paginator its total) and one query for the page slice
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('job_list'), {'page': 2})
+        self.assertEqual(len(response.context['jobs'].object_list), 6)
+
+
+class FacetTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        make_job(cls.employer, title='Dhaka Contract', location='Dhaka, Bangladesh', job_type='contract')
+        make_job(cls.employer, title='Dhaka Full Time', location='  dhaka ,BD', job_type='full_time')
+        make_job(cls.employer, title='Remote Full Time', location='Remote (Asia)', job_type='full_time')
+        old = make_job(cls.employer, title='Old Sylhet Job', location='Sylhet, Bangladesh', job_type='full_time')
+        Job.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=10))
+
+    def facet(self, response, name):
+        facet = next(facet for facet in response.context['facets'] if facet['name'] == name)
+        return {option['value']: (option['count'], option['selected']) for option in facet['options']}
+
+    def test_location_key_is_normalized_on_save(self):
+        keys = dict(Job.objects.values_list('title', 'location_key'))
+        self.assertEqual(keys['Dhaka Full Time'], 'dhaka')
+        self.assertEqual(keys['Remote Full Time'], 'remote')
+        job = Job.objects.get(title='Old Sylhet Job')
+        job.location = 'Khulna, Bangladesh'
+        job.save(update_fields=['location'])
+        self.assertEqual(Job.objects.get(pk=job.pk).location_key, 'khulna')
+
+    def test_counts_ignore_their_own_filter(self):
+        response = self.client.get(reverse('job_list'), {'location': 'Dhaka', 'job_type': 'full_time'})
+
+        self.assertEqual([job.title for job in response.context['jobs']], ['Dhaka Full Time'])
+        self.assertEqual(response.context['total_count'], 1)
+        job_types = self.facet(response, 'job_type')
+        self.assertEqual(job_types['full_time'], (1, True))
+        self.assertEqual(job_types['contract'], (1, False))
+        self.assertEqual(job_types['internship'], (0, False))
+        self.assertEqual(self.facet(response, 'location'), {
+            'dhaka': (1, True), 'remote': (1, False), 'sylhet': (1, False),
+        })
+        self.assertEqual(self.facet(response, 'posted'), {'1': (1, False), '7': (1, False), '30': (1, False)})
+
+    def test_posted_filter_and_toggle_links(self):
+        response = self.client.get(reverse('job_list'), {'posted': '7', 'page': 2, 'q': 'full'})
+
+        self.assertEqual(response.context['total_count'], 2)
+        options = next(facet for facet in response.context['facets'] if facet['name'] == 'posted')['options']
+        self.assertEqual(options[1]['query'], 'q=full')
+        self.assertEqual(options[0]['query'], 'q=full&posted=1')
+        self.assertEqual(self.facet(response, 'posted'), {'1': (2, False), '7': (2, True), '30': (2, False)})
+
+    def test_unknown_filter_values_are_ignored(self):
+        response = self.client.get(reverse('job_list'), {'job_type': 'nope', 'posted': '2'})
+        self.assertEqual(response.context['total_count'], 4)
+        self.assertEqual(response.context['filters'], {})
+
+    def test_counts_are_cached_until_a_job_changes(self):
+        self.client.get(reverse('job_list'), {'job_type': 'contract'})
+        # Only the page itself; the facets and the total come from the cache
+        with self.assertNumQueries(1):
+            self.client.get(reverse('job_list'), {'job_type': 'contract', 'page': 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.employer, title='Chattogram Contract', location='Chattogram', job_type='contract')
+        response = self.client.get(reverse('job_list'), {'job_type': 'contract'})
+        self.assertEqual(response.context['total_count'], 2)
+        self.assertEqual(self.facet(response, 'location')['chattogram'], (1, False))
+
+
+class SalaryTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+
+    def test_parse_salary(self):
+        cases = {
+            '50,000 - 80,000 BDT/month': Salary(Decimal(50000), Decimal(80000), 'BDT', 'month'),
+            'BDT 1,20,000 per month': Salary(Decimal(120000), Decimal(120000), 'BDT', 'month'),
+            '৳40k-60k': Salary(Decimal(40000), Decimal(60000), 'BDT', 'month'),
+            '$60k - $80k': Salary(Decimal(60000), Decimal(80000), 'USD', 'year'),
+            'USD 45/hour': Salary(Decimal(45), Decimal(45), 'USD', 'hour'),
+            '1.2 lakh BDT/month': Salary(Decimal(120000), Decimal(120000), 'BDT', 'month'),
+            'Negotiable': None,
+            '': None,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_salary(text), expected)
+        self.assertEqual(parse_salary('$90,000 - $120,000 per year').monthly(), (7500, 10000))
+
+    def test_save_stores_monthly_range(self):
+        job = make_job(self.employer, salary='USD 45/hour')
+        self.assertEqual((job.salary_min, job.salary_max, job.salary_currency, job.salary_period),
+                         (7800, 7800, 'USD', 'hour'))
+
+        job.salary = 'Negotiable'
+        job.save(update_fields=['salary'])
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min, job.salary_max, job.salary_currency), (None, None, ''))
+
+    def test_backfill_migration_fills_unparsed_rows(self):
+        migration = importlib.import_module('jobs.migrations.0014_backfill_job_salary')
+        jobs = [make_job(self.employer, salary=f'{n}0,000 - {n + 1}0,000 BDT') for n in range(1, 6)]
+        Job.objects.filter(pk__in=[job.pk for job in jobs[1:]]).update(
+            salary_min=None, salary_max=None, salary_currency='', salary_period='',
+        )
+        with mock.patch.object(migration, 'BATCH_SIZE', 2):
+            migration.backfill_salaries(apps, mock.Mock(connection=connection))
+        self.assertEqual(
+            list(Job.objects.order_by('pk').values_list('salary_min', 'salary_max')),
+            [(n * 10000, (n + 1) * 10000) for n in range(1, 6)],
+        )
+
+    def test_job_list_filters_and_sorts_by_salary(self):
+        make_job(self.employer, title='Low', salary='20,000 - 30,000 BDT')
+        make_job(self.employer, title='Mid', salary='40k-60k BDT/month')
+        make_job(self.employer, title='High', salary='1.2 lakh BDT/month')
+        make_job(self.employer, title='Dollars', salary='$90,000 per year')
+        make_job(self.employer, title='Unstated', salary='Negotiable')
+
+        response = self.client.get(reverse('job_list'), {'sort': 'salary_high'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['High', 'Mid', 'Low'])
+        response = self.client.get(reverse('job_list'), {'sort': 'salary_low', 'min_salary': '35000'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['Mid', 'High'])
+        self.assertEqual(response.context['total_count'], 2)
+        response = self.client.get(reverse('job_list'), {'currency': 'usd', 'max_salary': '8000'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['Dollars'])
+        response = self.client.get(reverse('job_list'), {'sort': 'oldest'})
+        self.assertEqual([job.title for job in response.context['jobs']][:2], ['Low', 'Mid'])
+
+    def test_pages_do_not_repeat_rows_with_equal_sort_values(self):
+        jobs = [make_job(self.employer, title=f'Tied {i}', salary='50,000 BDT') for i in range(9)]
+        Job.objects.update(created_at=timezone.now() - timedelta(days=1))
+        for sort in ('latest', 'oldest', 'salary_high', 'salary_low'):
+            seen = []
+            for page in (1, 2):
+                response = self.client.get(reverse('job_list'), {'sort': sort, 'page': page})
+                seen += [job.pk for job in response.context['jobs']]
+            # Which tied rows a database returns first is otherwise up to it
+            self.assertEqual(response.context['jobs'].paginator.object_list.query.order_by[-1].lstrip('-'), 'id')
+            self.assertEqual(sorted(seen), sorted(job.pk for job in jobs), sort)
+
+
+class LocationTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        for title, location in [
+            ('Dhaka Job', 'Gulshan, Dhaka'), ('Gazipur Job', 'Tongi, Gazipur'),
+            ('Narayanganj Job', 'Narayanganj'), ('Sylhet Job', 'Sylhet, Bangladesh'),
+            ('Remote Job', 'Remote (Asia)'), ('Berlin Job', 'Berlin, Germany'),
+        ]:
+            make_job(cls.employer, title=title, location=location)
+
+    def titles(self, response):
+        return sorted(job.title for job in response.context['jobs'])
+
+    def test_resolve_location(self):
+        cases = {
+            'Chittagong, BD': 'chattogram', 'New York, NY': 'new york', 'Hybrid - Dhaka': 'dhaka',
+            'Bangalore': 'bengaluru', "Cox's Bazar": "cox's bazar", 'Remote (Asia)': None, 'Atlantis': None,
+        }
+        for text, key in cases.items():
+            with self.subTest(text=text):
+                place = resolve_location(text)
+                self.assertEqual(place and place.key, key)
+        self.assertTrue(is_remote('Work from home'))
+        self.assertEqual(normalize_location('Remote (Asia)'), 'remote')
+        self.assertEqual(normalize_location('Atlantis, Sea'), 'atlantis')
+
+    def test_save_stores_canonical_location(self):
+        job = Job.objects.get(title='Gazipur Job')
+        self.assertEqual(
+            (job.location_key, job.location_region, job.location_country, job.latitude, job.is_remote),
+            ('gazipur', 'Dhaka Division', 'Bangladesh', 23.9999, False),
+        )
+        self.assertTrue(Job.objects.get(title='Remote Job').is_remote)
+        self.assertIsNone(Job.objects.get(title='Remote Job').latitude)
+
+    def test_job_list_near_and_remote(self):
+        response = self.client.get(reverse('job_list'), {'near': 'Dhaka', 'radius': '10'})
+        self.assertEqual(self.titles(response), ['Dhaka Job'])
+        response = self.client.get(reverse('job_list'), {'near': 'dacca', 'radius': '25'})
+        self.assertEqual(self.titles(response), ['Dhaka Job', 'Gazipur Job', 'Narayanganj Job'])
+        self.assertEqual(response.context['near_label'], 'Dhaka')
+        response = self.client.get(reverse('job_list'), {'near': 'Dhaka', 'radius': '250'})
+        self.assertEqual(response.context['total_count'], 4)
+        response = self.client.get(reverse('job_list'), {'remote': '1'})
+        self.assertEqual(self.titles(response), ['Remote Job'])
+        response = self.client.get(reverse('job_list'), {'location': 'Chittagong'})
+        self.assertEqual(response.context['total_count'], 0)
+
+    def test_api_location_filters(self):
+        url = reverse('api_job_search')
+        data = self.client.get(url, {'near': 'Dhaka', 'radius': '30', 'fields': 'title'}).json()
+        self.assertEqual(sorted(job['title'] for job in data['results']), ['Dhaka Job', 'Gazipur Job', 'Narayanganj Job'])
+        data = self.client.get(url, {'location': 'Banani', 'fields': 'title,location_key'}).json()
+        self.assertEqual(data['results'], [{'title': 'Dhaka Job', 'location_key': 'dhaka'}])
+        self.assertEqual(self.client.get(url, {'remote': 'true'}).json()['results'][0]['title'], 'Remote Job')
+        self.assertEqual(self.client.get(url, {'near': 'Atlantis'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'near': 'Dhaka', 'radius': '9000'}).status_code, 400)
+
+
+class CursorPaginationTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.jobs = [make_job(cls.employer, title=f'Developer {i:02d}') for i in range(14)]
+        cls.newest_first = cls.jobs[::-1]
+
+    def test_walks_forward_and_back(self):
+        paginator = CursorPaginator(Job.objects.for_listing(), 6)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        self.assertEqual(list(first) + list(second) + list(third), self.newest_first)
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+        self.assertEqual(list(paginator.page(third.previous_cursor)), list(second))
+        self.assertEqual(list(paginator.page(second.previous_cursor)), list(first))
+
+    def test_deep_page_query_does_not_use_offset(self):
+        paginator = CursorPaginator(Job.objects.for_listing(), 6)
+        cursor = paginator.page().next_cursor
+        with self.assertNumQueries(1) as context:
+            paginator.page(cursor)
+        self.assertNotIn('OFFSET', context.captured_queries[0]['sql'])
+
+    def test_tampered_cursor_falls_back_to_first_page(self):
+        response = self.client.get(reverse('job_list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(list(response.context['jobs']), self.newest_first[:6])
+        self.assertContains(response, '14 Jobs Available')
+
+
+class EmployerDashboardTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicants = [
+            User.objects.create_user(f'applicant{i}', password='pass12345') for i in range(3)
+        ]
+
+    def add_jobs(self, count):
+        for i in range(count):
+            job = make_job(self.employer, title=f'Developer {i:02d}')
+            for applicant, status in zip(self.applicants, ['pending', 'approved', 'rejected']):
+                Application.objects.create(
+                    job=job, applicant=applicant, status=status,
+                    resume='resumes/cv.pdf', cover_letter='x' * 50,
+                )
+
+    def dashboard_queries(self):
+        self.client.force_login(self.employer)
+        # Warm up the session so only the dashboard's own queries are measured
+        self.client.get(reverse('dashboard'))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('dashboard'))
+        return response, len(context)
+
+    def test_query_count_does_not_grow_with_jobs(self):
+        self.add_jobs(2)
+        _, few_jobs = self.dashboard_queries()
+        self.add_jobs(20)
+        response, many_jobs = self.dashboard_queries()
+
+        self.assertEqual(few_jobs, many_jobs)
+        self.assertLessEqual(many_jobs, 3)
+        self.assertEqual(len(response.context['jobs']), 22)
+
+    def test_counts_are_read_from_stored_counters(self):
+        self.add_jobs(1)
+        response, _ = self.dashboard_queries()
+        job = response.context['jobs'][0]
+
+        self.assertEqual(
+            (job.application_count, job.pending_count, job.approved_count, job.rejected_count),
+            (3, 1, 1, 1),
+        )
+
+
+class ApplicationCounterTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+
+    def apply(self, job, applicant=None, status='pending'):
+        return Application.objects.create(
+            job=job, applicant=applicant or self.applicant, status=status,
+            resume='resumes/cv.pdf', cover_letter='x' * 50,
+        )
+
+    def counters(self, job):
+        job.refresh_from_db()
+        return job.application_count, job.pending_count, job.approved_count, job.rejected_count
+
+    def test_counters_follow_create_status_change_and_delete(self):
+        job = make_job(self.employer)
+        application = self.apply(job)
+        self.assertEqual(self.counters(job), (1, 1, 0, 0))
+
+        application = Application.objects.get(pk=application.pk)
+        application.status = 'approved'
+        application.save()
+        application.save()
+        self.assertEqual(self.counters(job), (1, 0, 1, 0))
+
+        application.delete()
+        self.assertEqual(self.counters(job), (0, 0, 0, 0))
+
+    def test_saving_a_stale_job_keeps_the_counters(self):
+        job = make_job(self.employer)
+        stale = Job.objects.get(pk=job.pk)
+        self.apply(job)
+        stale.title = 'Edited title'
+        stale.save()
+        self.assertEqual(self.counters(job), (1, 1, 0, 0))
+        self.assertEqual(job.title, 'Edited title')
+
+    def test_saving_a_stale_application_counts_its_current_status(self):
+        job = make_job(self.employer)
+        application = self.apply(job)
+        stale = Application.objects.get(pk=application.pk)
+        # An employer's status change lands between the admin loading and saving it
+        Application.objects.filter(pk=application.pk).set_status('approved')
+        stale.status = 'rejected'
+        stale.save()
+        self.assertEqual(self.counters(job), (1, 0, 0, 1))
+        self.assertEqual(
+            list(ApplicationStatusChange.objects.order_by('pk').values_list('old_status', 'new_status')),
+            [('pending', 'approved'), ('approved', 'rejected')],
+        )
+
+    def test_update_status_view_moves_counters(self):
+        job = make_job(self.employer)
+        application = self.apply(job)
+        self.client.force_login(self.employer)
+
+        self.client.post(reverse('update_application_status', args=[application.pk]), {'status': 'rejected'})
+        self.assertEqual(self.counters(job), (1, 0, 0, 1))
+
+    def test_bulk_status_update(self):
+        job = make_job(self.employer)
+        applicants = [User.objects.create_user(f'bulk{i}', password='pass12345') for i in range(3)]
+        applications = [self.apply(job, applicant=applicant) for applicant in applicants]
+        self.apply(job, status='approved')
+        other_job = make_job(User.objects.create_user('rival', password='pass12345', is_employer=True))
+        foreign = self.apply(other_job)
+        self.client.force_login(self.employer)
+
+        url = reverse('bulk_update_application_status', args=[job.pk])
+        ids = [application.pk for application in applications[:2]]
+        response = self.client.post(url, {'status': 'approved', 'application_ids': ids})
+        self.assertRedirects(response, reverse('manage_applications', args=[job.pk]), fetch_redirect_response=False)
+        self.assertEqual(self.counters(job), (4, 1, 3, 0))
+        self.assertEqual(
+            sorted(ApplicationStatusChange.objects.values_list('application_id', 'old_status', 'new_status')),
+            [(pk, 'pending', 'approved') for pk in ids],
+        )
+
+        # Another employer's application in the selection is left alone
+        self.client.post(url, {'status': 'rejected', 'application_ids': [applications[2].pk, foreign.pk]})
+        self.assertEqual(self.counters(job), (4, 0, 3, 1))
+        self.assertEqual(Application.objects.get(pk=foreign.pk).status, 'pending')
+        self.assertEqual(ApplicationStatusChange.objects.count(), 3)
+
+    def test_cascading_delete_of_applicant(self):
+        job = make_job(self.employer)
+        other = User.objects.create_user('other', password='pass12345')
+        self.apply(job)
+        self.apply(job, applicant=other, status='approved')
+
+        other.delete()
+        self.assertEqual(self.counters(job), (1, 1, 0, 0))
+
+    def test_reconcile_repairs_drift(self):
+        job = make_job(self.employer)
+        self.apply(job)
+        Job.objects.filter(pk=job.pk).update(application_count=7, pending_count=0, rejected_count=3)
+
+        out = StringIO()
+        call_command('reconcile_application_counters', stdout=out)
+        self.assertIn('Repaired 1', out.getvalue())
+        self.assertEqual(self.counters(job), (1, 1, 0, 0))
+
+
+class QueryPlanTests(JobsTestCase):
+    """Each view's main query is answered from the index declared for it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+        cls.job = make_job(cls.employer)
+        Application.objects.create(
+            job=cls.job, applicant=cls.applicant, resume='resumes/cv.pdf', cover_letter='x' * 50,
+        )
+
+    def plans_for(self, url, table, user=None, data=None):
+        if user:
+            self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url, data)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in context.captured_queries:
+                if f'FROM "{table}"' in query['sql']:
+                    cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                    plans.append(' | '.join(row[-1] for row in cursor.fetchall()))
+        return plans
+
+    def assertPlanUses(self, plans, index):
+        self.assertTrue(any(index in plan for plan in plans), f'{index} not used by any of {plans}')
+
+    def test_job_list_ordering(self):
+        plans = self.plans_for(reverse('job_list'), 'jobs_job')
+        self.assertPlanUses(plans, 'job_recent_idx')
+
+    def test_filtered_job_list(self):
+        plans = self.plans_for(reverse('job_list'), 'jobs_job', data={'job_type': 'contract'})
+        self.assertPlanUses(plans, 'job_type_recent_idx')
+        plans = self.plans_for(reverse('job_list'), 'jobs_job', data={'location': 'dhaka'})
+        self.assertPlanUses(plans, 'job_location_recent_idx')
+
+    def test_salary_sort(self):
+        make_job(self.employer, salary='50,000 BDT')
+        plans = self.plans_for(reverse('job_list'), 'jobs_job', data={'sort': 'salary_high', 'min_salary': 1000})
+        # The page itself, fetched last, is read in index order
+        self.assertIn('job_salary_max_idx', plans[-1])
+        self.assertNotIn('TEMP B-TREE', plans[-1])
+
+    def test_proximity_and_remote(self):
+        plans = self.plans_for(reverse('job_list'), 'jobs_job', data={'near': 'Dhaka'})
+        self.assertPlanUses(plans, 'job_coordinates_idx (latitude>? AND latitude<?)')
+        plans = self.plans_for(reverse('job_list'), 'jobs_job', data={'remote': '1'})
+        self.assertPlanUses(plans, 'job_remote_recent_idx')
+
+    def test_employer_dashboard(self):
+        plans = self.plans_for(reverse('dashboard'), 'jobs_job', user=self.employer)
+        self.assertPlanUses(plans, 'job_poster_recent_idx')
+
+    def test_manage_applications(self):
+        url = reverse('manage_applications', args=[self.job.pk])
+        plans = self.plans_for(url, 'jobs_application', user=self.employer)
+        self.assertPlanUses(plans, 'application_job_status_idx')
+        self.assertFalse(any('TEMP B-TREE' in plan for plan in plans), plans)
+        plans = self.plans_for(url, 'jobs_application', data={'status': 'pending'})
+        self.assertPlanUses(plans, 'application_job_status_idx')
+
+    def test_applicant_dashboard(self):
+        plans = self.plans_for(reverse('dashboard'), 'jobs_application', user=self.applicant, data={'status': 'pending'})
+        self.assertPlanUses(plans, 'application_applicant_idx')
+
+    def test_has_applied_check(self):
+        plans = self.plans_for(reverse('job_detail', args=[self.job.pk]), 'jobs_application', user=self.applicant)
+        self.assertPlanUses(plans, '(job_id=? AND applicant_id=?)')
+
+    def test_sqlite_connections_are_tuned(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        # The in-memory test database has no journal to switch, so use a file
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        default = connections['default']
+        scratch = connections['scratch'] = type(default)(
+            {**default.settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3')}, 'scratch',
+        )
+        self.addCleanup(connections.__delitem__, 'scratch')
+        self.addCleanup(scratch.close)
+
+        pragmas = {**settings.SQLITE_PRAGMAS, 'journal_mode': 'WAL', 'synchronous': 'NORMAL'}
+        with override_settings(SQLITE_PRAGMAS=pragmas), scratch.cursor() as cursor:
+            for name, expected in [('journal_mode', 'wal'), ('synchronous', 1), ('busy_timeout', 5000)]:
+                cursor.execute(f'PRAGMA {name}')
+                self.assertEqual(cursor.fetchone()[0], expected, name)
+
+        with CaptureQueriesContext(scratch) as queries, transaction.atomic(using='scratch'):
+            pass
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+    def test_duplicate_application_is_rejected_by_the_database(self):
+        with self.assertRaises(IntegrityError):
+            Application.objects.create(
+                job=self.job, applicant=self.applicant, resume='resumes/cv.pdf', cover_letter='x' * 50,
+            )
+
+
+class QueryBudgetTests(JobsTestCase):
+    """
+    Every route in jobs/urls.py runs a fixed number of queries, however many
+    jobs and applications are on the page. A route that starts loading
+    related rows one by one blows its budget here.
+    """
+
+    # Queries allowed per route, including the session and user lookups of
+    # logged-in requests
+    BUDGETS = {
+        'home': 5,
+        'job_list': 5,
+        'register': 0,
+        'login': 0,
+        'logout': 4,
+        'dashboard': 3,
+        'post_job': 3,
+        'job_detail': 4,
+        'manage_applications': 4,
+        'update_application_status': 9,
+        'bulk_update_application_status': 9,
+        'download_resume': 3,
+        'download_resumes': 5,
+        'api_job_search': 1,
+        'api_job_export': 1,
+        'api_job_suggest': 3,
+        'performance_stats': 2,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+        cls.staff = User.objects.create_user('staff', password='pass12345', is_staff=True)
+        cls.jobs = [make_job(cls.employer, title=f'Developer {i:02d}') for i in range(8)]
+        cls.job = cls.jobs[0]
+        cls.applications = []
+        for i in range(8):
+            applicant = User.objects.create_user(f'applicant{i}', password='pass12345')
+            cls.applications.append(Application.objects.create(
+                job=cls.job, applicant=applicant, resume='resumes/cv.pdf', cover_letter='x' * 50,
+            ))
+        for job in cls.jobs:
+            cls.application = Application.objects.create(
+                job=job, applicant=cls.applicant, resume='resumes/cv.pdf', cover_letter='x' * 50,
+            )
+
+    def requests(self):
+        """(url name, user, method, url, data) for every route, plus variants."""
+        return [
+            ('home', None, 'get', reverse('home'), {}),
+            ('job_list', None, 'get', reverse('job_list'), {'q': 'developer'}),
+            ('job_list', None, 'get', reverse('job_list'), {'paginate': 'cursor'}),
+            ('register', None, 'get', reverse('register'), {}),
+            ('login', None, 'get', reverse('login'), {}),
+            ('logout', self.applicant, 'get', reverse('logout'), {}),
+            ('dashboard', self.employer, 'get', reverse('dashboard'), {}),
+            ('dashboard', self.applicant, 'get', reverse('dashboard'), {}),
+            ('dashboard', self.applicant, 'get', reverse('dashboard'), {'status': 'pending'}),
+            ('post_job', self.employer, 'get', reverse('post_job'), {'edit': self.job.pk}),
+            ('job_detail', self.applicant, 'get', reverse('job_detail', args=[self.job.pk]), {}),
+            ('job_detail', self.employer, 'get', reverse('job_detail', args=[self.job.pk]), {}),
+            ('manage_applications', self.employer, 'get',
+             reverse('manage_applications', args=[self.job.pk]), {}),
+            ('update_application_status', self.employer, 'post',
+             reverse('update_application_status', args=[self.application.pk]), {'status': 'approved'}),
+            ('bulk_update_application_status', self.employer, 'post',
+             reverse('bulk_update_application_status', args=[self.job.pk]),
+             {'status': 'rejected', 'application_ids': [application.pk for application in self.applications]}),
+            ('download_resumes', self.employer, 'get', reverse('download_resumes', args=[self.job.pk]), {}),
+            ('download_resumes', self.employer, 'get',
+             reverse('download_resumes', args=[self.job.pk]), {'status': 'pending'}),
+            ('download_resume', self.employer, 'get', reverse('download_resume', args=[self.application.pk]), {}),
+            ('api_job_search', None, 'get', reverse('api_job_search'), {'q': 'developer', 'fields': 'id,title'}),
+            ('api_job_export', None, 'get', reverse('api_job_export'), {}),
+            ('api_job_suggest', None, 'get', reverse('api_job_suggest'), {'q': 'dev'}),
+            ('performance_stats', self.staff, 'get', reverse('performance_stats'), {}),
+        ]
+
+    def test_every_route_has_a_budget(self):
+        from .urls import urlpatterns
+
+        self.assertEqual({pattern.name for pattern in urlpatterns}, set(self.BUDGETS))
+        self.assertEqual({name for name, *_ in self.requests()}, set(self.BUDGETS))
+
+    def test_routes_stay_within_budget(self):
+        media_root = self.use_temp_media()
+        os.makedirs(os.path.join(media_root, 'resumes'))
+        with open(os.path.join(media_root, 'resumes', 'cv.pdf'), 'wb') as resume:
+            resume.write(b'%PDF-1.4 resume')
+
+        for name, user, method, url, data in self.requests():
+            with self.subTest(route=name, url=url, data=data, user=user and user.username):
+                cache.clear()
+                self.client.logout()
+                if user:
+                    self.client.force_login(user)
+                with CaptureQueriesContext(connection) as context:
+                    response = getattr(self.client, method)(url, data)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                self.assertLess(response.status_code, 400)
+                self.assertLessEqual(
+                    len(context), self.BUDGETS[name],
+                    '\n'.join(query['sql'] for query in context.captured_queries),
+                )
+
+
+class PublicPageCacheTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        make_job(cls.employer, title='Python Engineer')
+
+    def test_warm_listing_hit_runs_no_queries(self):
+        self.client.get(reverse('job_list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('job_list'))
+        self.assertContains(response, 'Python Engineer')
+        self.assertIn('Cookie', response['Vary'])
+
+    def test_pages_are_cached_per_query_and_page(self):
+        self.client.get(reverse('job_list'))
+        with self.assertNumQueries(4):
+            self.client.get(reverse('job_list'), {'q': 'python'})
+
+    def test_posting_a_job_invalidates_cached_pages(self):
+        self.client.get(reverse('job_list'))
+        self.client.force_login(self.employer)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('post_job'), {'title': 'Rust Engineer', 'job_type': 'full_time'})
+        self.client.logout()
+
+        response = self.client.get(reverse('job_list'))
+        self.assertContains(response, 'Rust Engineer')
+
+    def test_the_version_moves_once_the_write_commits(self):
+        version = listing_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.employer, title='Rust Engineer')
+            # Pages rendered before the commit still belong to the old version
+            self.assertEqual(listing_version(), version)
+        self.assertNotEqual(listing_version(), version)
+
+    def test_edits_show_up_on_job_detail(self):
+        job = Job.objects.get()
+        applicant = User.objects.create_user('applicant', password='pass12345')
+        self.client.force_login(applicant)
+        self.client.get(reverse('job_detail', args=[job.pk]))
+
+        job.description = 'Now with a brand new description.'
+        with self.captureOnCommitCallbacks(execute=True):
+            job.save()
+        self.assertContains(self.client.get(reverse('job_detail', args=[job.pk])), 'brand new description')
+
+    def test_job_deleted_by_another_process_is_a_404(self):
+        url = reverse('job_detail', args=[Job.objects.get().pk])
+        self.client.force_login(User.objects.create_user('applicant', password='pass12345'))
+        self.client.get(url)
+        # The cached copy outlives the row when another process deletes it
+        with mock.patch('jobs.signals.bump_listing_version'):
+            Job.objects.all().delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_logged_in_users_are_not_served_the_shared_page(self):
+        self.client.get(reverse('job_list'))
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse('job_list'))
+        self.assertContains(response, reverse('logout'))
+
+
+class ConditionalGetTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+        cls.job = make_job(cls.employer, title='Python Engineer')
+
+    def test_listing_answers_if_none_match_without_queries(self):
+        response = self.client.get(reverse('job_list'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('job_list'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_browsers_revalidate_instead_of_guessing_freshness(self):
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        response = self.client.get(reverse('job_list'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual((response.status_code, response['Cache-Control']), (304, 'no-cache'))
+
+        self.client.force_login(self.applicant)
+        for url in (reverse('job_list'), reverse('job_detail', args=[self.job.pk])):
+            response = self.client.get(url)
+            self.assertEqual(set(response['Cache-Control'].split(', ')), {'no-cache', 'private'})
+
+    def test_listing_validators_change_when_jobs_change(self):
+        etag = self.client.get(reverse('job_list'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.get().delete()
+        response = self.client.get(reverse('job_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_listing_if_modified_since(self):
+        last_modified = self.client.get(reverse('job_list'))['Last-Modified']
+        response = self.client.get(reverse('job_list'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_job_detail_validators(self):
+        self.client.force_login(self.applicant)
+        url = reverse('job_detail', args=[self.job.pk])
+        etag = self.client.get(url)['ETag']
+
+        # Session, user and one primary key lookup before the 304
+        with self.assertNumQueries(3):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Application.objects.create(
+            job=self.job, applicant=self.applicant, resume='resumes/cv.pdf', cover_letter='x' * 50,
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_job_detail_etag_is_per_user(self):
+        url = reverse('job_detail', args=[self.job.pk])
+        self.client.force_login(self.applicant)
+        etag = self.client.get(url)['ETag']
+        self.client.force_login(self.employer)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class JobAPITests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.jobs = [
+            make_job(cls.employer, title=f'Python Developer {i}', job_type='full_time' if i % 2 else 'internship')
+            for i in range(5)
+        ]
+
+    def test_filters_fields_and_cursor_pagination(self):
+        url = reverse('api_job_search')
+        data = self.client.get(url, {'job_type': 'internship', 'fields': 'id,title', 'limit': 2}).json()
+
+        self.assertEqual(data['results'], [
+            {'id': self.jobs[4].pk, 'title': 'Python Developer 4'},
+            {'id': self.jobs[2].pk, 'title': 'Python Developer 2'},
+        ])
+        self.assertIsNone(data['previous'])
+        data = self.client.get(data['next']).json()
+        self.assertEqual([job['id'] for job in data['results']], [self.jobs[0].pk])
+        self.assertIsNone(data['next'])
+
+    def test_rejects_unknown_fields_and_bad_dates(self):
+        url = reverse('api_job_search')
+        self.assertEqual(self.client.get(url, {'fields': 'id,password'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'since': '2000-01-01'}).json()['results'][0]['id'], self.jobs[-1].pk)
+
+    def test_impossible_dates_are_bad_requests(self):
+        for url in (reverse('api_job_search'), reverse('api_job_export')):
+            for since in ('2024-02-30', '2024-13-45', '2024-01-01T25:00'):
+                response = self.client.get(url, {'since': since})
+                self.assertEqual(response.status_code, 400, (url, since))
+                self.assertEqual(response.json()['error'], 'since must be an ISO 8601 date or datetime.')
+        response = self.client.get(reverse('api_job_search'), {'limit': 'x'})
+        self.assertEqual(response.json()['error'], 'limit must be an integer.')
+
+    def test_export_streams_ndjson(self):
+        response = self.client.get(reverse('api_job_export'), {'fields': 'id,description', 'q': 'python'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{'id': job.pk, 'description': job.description} for job in self.jobs],
+        )
+
+
+class SuggestTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        for title, company, location in [
+            ('Backend Developer', 'Pathao', 'Dhaka'), ('Backend Developer', 'bKash', 'Gulshan, Dhaka'),
+            ('Senior Backend Developer', 'Pathao', 'Chittagong'), ('DevOps Engineer', 'Devsoft', 'Delhi'),
+        ]:
+            make_job(cls.employer, title=title, company_name=company, location=location)
+
+    def suggest(self, **params):
+        response = self.client.get(reverse('api_job_suggest'), params)
+        self.assertEqual(response.status_code, 200)
+        return [(item['kind'], item['text'], item['count']) for item in response.json()['suggestions']]
+
+    def test_word_prefixes_ranked_by_frequency(self):
+        self.assertEqual(self.suggest(q='dev'), [
+            ('title', 'Backend Developer', 2), ('title', 'DevOps Engineer', 1),
+            ('company', 'Devsoft', 1), ('title', 'Senior Backend Developer', 1),
+        ])
+        self.assertEqual(self.suggest(q='D', kind='location'), [('location', 'Dhaka', 2), ('location', 'Delhi', 1)])
+        self.assertEqual(self.suggest(q='backend dev', limit=1), [('title', 'Backend Developer', 2)])
+        self.assertEqual(self.suggest(q=''), [])
+
+    def test_lookups_do_not_touch_the_database(self):
+        self.suggest(q='p')
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api_job_suggest'), {'q': 'pat'})
+        self.assertEqual(response.json()['suggestions'][0]['text'], 'Pathao')
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+    def test_writes_are_applied_incrementally(self):
+        self.suggest(q='x')
+        before = suggest.get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            job = make_job(self.employer, title='Data Engineer', company_name='Pathao', location='Sylhet')
+        with self.captureOnCommitCallbacks(execute=True):
+            job = Job.objects.get(pk=job.pk)
+            job.title = 'Data Scientist'
+            job.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest(q='data'), [('title', 'Data Scientist', 1)])
+            self.assertEqual(self.suggest(q='pathao'), [('company', 'Pathao', 3)])
+        # Copy on write: readers holding the old snapshot are unaffected
+        self.assertEqual(before.lookup('data'), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.filter(title__startswith='DevOps').delete()
+        self.assertEqual(self.suggest(q='devo'), [])
+
+    def test_rebuilds_after_writes_in_other_processes(self):
+        self.suggest(q='x')
+        # Another process: a row changes behind the index, with no trace in this one
+        Job.objects.filter(company_name='Devsoft').update(company_name='Devworks')
+        self.assertEqual(self.suggest(q='devw'), [])
+        with override_settings(SUGGEST_REFRESH_INTERVAL=0):
+            self.assertEqual(self.suggest(q='devw'), [('company', 'Devworks', 1)])
+        # Applying this process's own writes does not postpone the next rebuild
+        built_at = suggest.get_index().built_at
+        suggest.apply_delta({('title', 'Local Title'): 1})
+        self.assertEqual(suggest.get_index().built_at, built_at)
+
+    def test_short_prefixes_rank_every_match(self):
+        counts = {('title', f'a{i:05d}'): 1 for i in range(2000)}
+        counts[('title', 'azzz popular')] = 500
+        index = suggest.PrefixIndex(counts)
+        self.assertEqual([item['text'] for item in index.lookup('a', limit=3)], ['azzz popular', 'a00000', 'a00001'])
+        self.assertEqual(index.lookup('az', kind='company'), [])
+
+        index = index.updated({('title', 'a01999'): 600, ('title', 'azzz popular'): -500})
+        self.assertEqual([item['text'] for item in index.lookup('a', limit=2)], ['a01999', 'a00000'])
+        self.assertEqual(index.lookup('azz'), [])
+        self.assertEqual(index.lookup('a019', limit=1)[0]['count'], 601)
+
+    def test_rejects_bad_parameters(self):
+        url = reverse('api_job_suggest')
+        self.assertEqual(self.client.get(url, {'q': 'a', 'kind': 'salary'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'q': 'a', 'limit': 'x'}).status_code, 400)
+
+
+class SimilarJobsTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+        cls.django, cls.flask, cls.data, cls.nurse = [
+            make_job(cls.employer, title=title, description=description, requirements=requirements)
+            for title, description, requirements in [
+                ('Django Developer', 'Build REST APIs in Python and Django.', 'Python, Django, PostgreSQL'),
+                ('Python Backend Developer', 'Build REST APIs with Python and Flask.', 'Python, Flask, PostgreSQL'),
+                ('Data Scientist', 'Train machine learning models in Python.', 'Python, pandas, statistics'),
+                ('Staff Nurse', 'Care for patients on the ward.', 'Nursing degree, patient care'),
+            ]
+        ]
+
+    def build(self, *args):
+        call_command('build_similar_jobs', *args, stdout=StringIO())
+
+    def similar_titles(self, job):
+        response = self.client.get(reverse('job_detail', args=[job.pk]))
+        return [similar_job.title for similar_job in response.context['similar_jobs']]
+
+    def test_detail_page_shows_nearest_jobs(self):
+        self.client.force_login(self.applicant)
+        self.assertEqual(self.similar_titles(self.django), [])
+
+        self.build()
+        self.assertEqual(self.similar_titles(self.django), ['Python Backend Developer', 'Data Scientist'])
+        # Nothing in common with the others
+        self.assertEqual(self.similar_titles(self.nurse), [])
+        response = self.client.get(reverse('job_detail', args=[self.django.pk]))
+        self.assertContains(response, 'Similar jobs')
+        self.similar_titles(self.flask)
+        # Cached per job: only the session, user and viewer's state are read
+        with self.assertNumQueries(3):
+            self.assertEqual(self.similar_titles(self.flask), ['Django Developer', 'Data Scientist'])
+
+    def test_incremental_build_adds_new_jobs(self):
+        self.build()
+        before = similar.load_model()
+        job = make_job(self.employer, title='Senior Django Developer', description='Django and Python APIs.')
+        self.build('--incremental')
+        model = similar.load_model()
+        self.assertEqual(list(model.job_ids), [*before.job_ids, job.pk])
+        self.assertEqual(model.terms.tolist(), before.terms.tolist())
+        self.assertEqual(similar.neighbor_ids(job.pk, similar.model_generation())[0], self.django.pk)
+        # Existing lists take the new job in where it ranks
+        self.assertIn(job.pk, similar.neighbor_ids(self.django.pk, similar.model_generation()))
+        self.assertNotIn(job.pk, similar.neighbor_ids(self.nurse.pk, similar.model_generation()))
+
+    def test_batched_neighbors_match_a_full_comparison(self):
+        matrix = similar._weighted(
+            sparse.random(50, 30, density=0.2, format='csr', random_state=1, dtype=np.float32), np.ones(30),
+        )
+        job_ids = np.arange(1, 51)
+        ids, scores = similar.top_neighbors(matrix, job_ids, matrix, job_ids, k=5, batch_size=7)
+        dense = (matrix @ matrix.T).toarray()
+        np.fill_diagonal(dense, 0)
+        for row in range(50):
+            expected = np.sort(dense[row])[::-1][:5]
+            np.testing.assert_allclose(scores[row], np.where(expected > 0, expected, 0), rtol=1e-5)
+            self.assertNotIn(job_ids[row], ids[row])
+
+
+class ResumeUploadTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+        cls.jobs = [make_job(cls.employer, title=f'Developer {i}') for i in range(2)]
+
+    def setUp(self):
+        super().setUp()
+        self.use_temp_media()
+        self.client.force_login(self.applicant)
+
+    def apply(self, job, content=b'%PDF-1.4 resume', name='cv.pdf'):
+        return self.client.post(reverse('job_detail', args=[job.pk]), {
+            'cover_letter': 'I would be a great fit for this position because ' + 'x' * 20,
+            'resume': SimpleUploadedFile(name, content, content_type='application/pdf'),
+        })
+
+    def test_identical_resumes_share_one_blob(self):
+        for job in self.jobs:
+            self.assertRedirects(self.apply(job), reverse('dashboard'), fetch_redirect_response=False)
+
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.size, len(b'%PDF-1.4 resume'))
+        self.assertEqual({a.resume.name for a in Application.objects.all()}, {blob.file.name})
+        self.assertIn(blob.sha256, blob.file.name)
+        with blob.file.open('rb') as stored:
+            self.assertEqual(stored.read(), b'%PDF-1.4 resume')
+
+    def test_a_blob_created_concurrently_is_reused(self):
+        self.apply(self.jobs[0])
+        first = QuerySet.first
+        missed = []
+
+        def miss_once(queryset):
+            # As if the other upload committed right after this one looked
+            if queryset.model is ResumeBlob and not missed:
+                missed.append(queryset)
+                return None
+            return first(queryset)
+
+        with mock.patch('django.db.models.QuerySet.first', autospec=True, side_effect=miss_once):
+            self.assertRedirects(self.apply(self.jobs[1]), reverse('dashboard'), fetch_redirect_response=False)
+        self.assertTrue(missed)
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual({application.resume_blob for application in Application.objects.all()}, {blob})
+
+    def test_the_name_chosen_by_the_storage_is_kept(self):
+        with mock.patch(
+            'django.core.files.storage.FileSystemStorage.get_available_name',
+            lambda storage, name, max_length=None: name.replace('.pdf', '_1.pdf'),
+        ):
+            self.apply(self.jobs[0])
+        blob = ResumeBlob.objects.get()
+        self.assertTrue(blob.file.name.endswith('_1.pdf'))
+        self.assertEqual(Application.objects.get().resume.name, blob.file.name)
+        with blob.file.open('rb') as stored:
+            self.assertEqual(stored.read(), b'%PDF-1.4 resume')
+
+    def test_last_reference_deletes_the_file(self):
+        for job in self.jobs:
+            self.apply(job)
+        blob = ResumeBlob.objects.get()
+        storage, name = blob.file.storage, blob.file.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.first().delete()
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+        self.assertTrue(storage.exists(name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.get().delete()
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertFalse(storage.exists(name))
+
+    @override_settings(RESUME_MAX_UPLOAD_SIZE=1024)
+    def test_oversized_upload_is_rejected_while_streaming(self):
+        response = self.apply(self.jobs[0], content=b'x' * 4096)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'File size exceeds the 5MB limit')
+        self.assertFalse(Application.objects.exists())
+        self.assertFalse(ResumeBlob.objects.exists())
+
+
+class ResumeDownloadTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.other_employer = User.objects.create_user('other', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+        cls.job = make_job(cls.employer)
+        cls.application = Application.objects.create(
+            job=cls.job, applicant=cls.applicant, resume='resumes/cv.pdf', cover_letter='x' * 50,
+        )
+        cls.url = reverse('download_resume', args=[cls.application.pk])
+
+    def setUp(self):
+        super().setUp()
+        media_root = self.use_temp_media()
+        os.makedirs(os.path.join(media_root, 'resumes'))
+        with open(os.path.join(media_root, 'resumes', 'cv.pdf'), 'wb') as resume:
+            resume.write(b'0123456789')
+        self.client.force_login(self.employer)
+
+    def test_only_the_employer_and_applicant_can_download(self):
+        response = self.client.get(self.url)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('applicant-resume.pdf', response['Content-Disposition'])
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        self.client.force_login(self.applicant)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.client.force_login(self.other_employer)
+        self.assertRedirects(self.client.get(self.url), reverse('dashboard'), fetch_redirect_response=False)
+
+    def test_media_is_not_served_publicly(self):
+        self.assertEqual(self.client.get('/media/resumes/cv.pdf').status_code, 404)
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_if_range_with_a_stale_etag_sends_the_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_conditional_get(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_zip_of_all_resumes_with_manifest(self):
+        second = User.objects.create_user('second', password='pass12345')
+        Application.objects.create(
+            job=self.job, applicant=second, resume='resumes/gone.pdf', cover_letter='x' * 50, status='approved',
+        )
+        response = self.client.get(reverse('download_resumes', args=[self.job.pk]))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        resume_name = f'resumes/applicant-{self.application.pk}.pdf'
+        self.assertEqual(archive.namelist(), ['manifest.csv', resume_name])
+        self.assertEqual(archive.getinfo(resume_name).compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.read(resume_name), b'0123456789')
+        manifest = list(csv.reader(io.StringIO(archive.read('manifest.csv').decode())))
+        self.assertEqual([row[0] for row in manifest], ['applicant', 'applicant', 'second'])
+        self.assertEqual(manifest[2][2], 'approved')
+        self.assertEqual((manifest[1][4], manifest[2][4]), (resume_name, 'missing'))
+
+        response = self.client.get(reverse('download_resumes', args=[self.job.pk]), {'status': 'approved'})
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), ['manifest.csv'])
+
+        self.client.force_login(self.other_employer)
+        response = self.client.get(reverse('download_resumes', args=[self.job.pk]))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+    @override_settings(RESUME_SENDFILE_MODE='x-accel-redirect')
+    def test_offload_to_nginx(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/resumes/cv.pdf')
+        self.assertEqual(response.content, b'')
+
+
+class StatusNotificationTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', 'applicant@example.com', 'pass12345')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pass12345')
+        cls.jobs = [make_job(cls.employer, title=f'Developer {i}') for i in range(2)]
+        cls.applications = [
+            Application.objects.create(job=job, applicant=cls.applicant, resume='resumes/cv.pdf', cover_letter='x' * 50)
+            for job in cls.jobs
+        ]
+        cls.other_application = Application.objects.create(
+            job=cls.jobs[0], applicant=cls.other, resume='resumes/cv.pdf', cover_letter='x' * 50,
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.employer)
+
+    def test_status_changes_are_queued_and_sent_as_one_digest_per_applicant(self):
+        self.client.post(reverse('update_application_status', args=[self.applications[0].pk]), {'status': 'approved'})
+        self.client.post(reverse('bulk_update_application_status', args=[self.jobs[0].pk]), {
+            'status': 'rejected', 'application_ids': [self.other_application.pk],
+        })
+        self.client.post(reverse('update_application_status', args=[self.applications[1].pk]), {'status': 'rejected'})
+        self.assertEqual(ApplicationStatusChange.objects.filter(notified_at__isnull=True).count(), 3)
+        self.assertEqual(mail.outbox, [])
+
+        with mock.patch('jobs.notifications.get_connection', wraps=mail.get_connection) as get_connection:
+            out = StringIO()
+            call_command('send_status_notifications', stdout=out)
+        get_connection.assert_called_once()
+        self.assertIn('Notified 3 status changes', out.getvalue())
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['applicant@example.com', 'other@example.com'])
+        digest = next(message for message in mail.outbox if message.to == ['applicant@example.com'])
+        self.assertIn('Developer 0 at Acme Ltd: pending -> approved', digest.body)
+        self.assertIn('Developer 1 at Acme Ltd: pending -> rejected', digest.body)
+        self.assertFalse(ApplicationStatusChange.objects.filter(notified_at__isnull=True).exists())
+
+        call_command('send_status_notifications', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_changes_to_one_application_are_coalesced(self):
+        url = reverse('update_application_status', args=[self.applications[0].pk])
+        for status in ('approved', 'rejected'):
+            self.client.post(url, {'status': status})
+        url = reverse('update_application_status', args=[self.other_application.pk])
+        for status in ('approved', 'pending'):
+            self.client.post(url, {'status': status})
+
+        self.assertEqual(send_pending_notifications(), (4, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('Developer 0 at Acme Ltd: pending -> rejected', mail.outbox[0].body)
+        self.assertNotIn('approved', mail.outbox[0].body)
+
+    def test_failed_sends_are_retried_with_backoff(self):
+        self.client.post(reverse('update_application_status', args=[self.applications[0].pk]), {'status': 'approved'})
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=SMTPException('down')):
+            self.assertEqual(send_pending_notifications(), (0, 1))
+        change = ApplicationStatusChange.objects.get()
+        self.assertEqual((change.attempts, change.last_error), (1, 'SMTPException: down'))
+        self.assertGreater(change.next_attempt_at, timezone.now())
+
+        # Not due yet, then sent once the delay has passed
+        self.assertEqual(send_pending_notifications(), (0, 0))
+        self.assertEqual(send_pending_notifications(now=timezone.now() + timedelta(minutes=5)), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_an_unreachable_mail_server_backs_the_batch_off(self):
+        for application in self.applications:
+            self.client.post(reverse('update_application_status', args=[application.pk]), {'status': 'approved'})
+        now = timezone.now()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=ConnectionRefusedError('refused')):
+            self.assertEqual(send_pending_notifications(now=now), (0, 2))
+        for change in ApplicationStatusChange.objects.all():
+            self.assertEqual((change.attempts, change.last_error), (1, 'ConnectionRefusedError: refused'))
+            self.assertEqual(change.next_attempt_at, now + timedelta(seconds=RETRY_BASE_DELAY))
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=ConnectionRefusedError('refused')):
+            self.assertEqual(send_pending_notifications(now=now + timedelta(days=1), max_attempts=2), (0, 2))
+        self.assertEqual(send_pending_notifications(now=now + timedelta(days=2), max_attempts=2), (0, 0))
+
+    def test_mail_is_sent_after_the_claim_commits(self):
+        self.client.post(reverse('update_application_status', args=[self.applications[0].pk]), {'status': 'approved'})
+        # The test case's own transaction stays open around the call
+        depth = len(connection.atomic_blocks)
+        seen = []
+
+        def send_messages(messages):
+            change = ApplicationStatusChange.objects.get()
+            seen.append((len(connection.atomic_blocks), change.next_attempt_at > timezone.now()))
+            raise SMTPException('down')
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=send_messages):
+            send_pending_notifications()
+        self.assertEqual(seen, [(depth, True)])
+
+    def test_claimed_rows_of_a_dead_worker_are_picked_up_after_the_lease(self):
+        self.client.post(reverse('update_application_status', args=[self.applications[0].pk]), {'status': 'approved'})
+        with mock.patch('jobs.notifications.get_connection', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                send_pending_notifications()
+
+        self.assertEqual(send_pending_notifications(), (0, 0))
+        self.assertEqual(send_pending_notifications(now=timezone.now() + timedelta(minutes=11)), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class AsyncViewTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.applicant = User.objects.create_user('applicant', password='pass12345')
+        cls.jobs = [make_job(cls.employer, title=f'Developer {i:02d}') for i in range(8)]
+        cls.application = Application.objects.create(
+            job=cls.jobs[0], applicant=cls.applicant, resume='resumes/cv.pdf', cover_letter='x' * 50,
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.route_async_views(True)
+        self.addCleanup(self.route_async_views, False)
+
+    def route_async_views(self, enabled):
+        with override_settings(ASYNC_VIEWS=enabled):
+            importlib.reload(jobs_urls)
+        # The project URLconf holds a resolver built from the old patterns
+        importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+        clear_url_caches()
+
+    def test_read_pages_are_routed_to_coroutines(self):
+        for url in (reverse('job_list'), reverse('dashboard'), reverse('job_detail', args=[self.jobs[0].pk])):
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(url).func), url)
+
+    async def test_job_list_pages_and_cache(self):
+        response = await self.async_client.get(reverse('job_list'), {'page': 2})
+        self.assertContains(response, '8 Jobs Available')
+        self.assertEqual([job.title for job in response.context['jobs']], ['Developer 01', 'Developer 00'])
+        self.assertIn('ETag', response)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        response = await self.async_client.get(reverse('job_list'), {'page': 99})
+        self.assertEqual(response.context['jobs'].number, 2)
+
+        response = await self.async_client.get(reverse('job_list'), {'page': 2})
+        self.assertIsNone(response.context)
+
+    async def test_job_list_filters(self):
+        await Job.objects.filter(pk=self.jobs[0].pk).aupdate(job_type='contract')
+        response = await self.async_client.get(reverse('job_list'), {'job_type': 'contract'})
+        self.assertEqual([job.title for job in response.context['jobs']], ['Developer 00'])
+        job_types = response.context['facets'][0]['options']
+        self.assertEqual([(option['value'], option['count']) for option in job_types[:2]],
+                         [('full_time', 7), ('part_time', 0)])
+
+    async def test_job_list_cursor_mode(self):
+        response = await self.async_client.get(reverse('job_list'), {'paginate': 'cursor'})
+        self.assertEqual(len(response.context['jobs']), 6)
+        self.assertTrue(response.context['jobs'].has_next())
+
+    def test_job_detail_and_dashboards(self):
+        self.client.force_login(self.applicant)
+        url = reverse('job_detail', args=[self.jobs[0].pk])
+        response = self.client.get(url)
+        self.assertTrue(response.context['has_applied'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(set(response['Cache-Control'].split(', ')), {'no-cache', 'private'})
+        self.assertIsNotNone(self.client.get(reverse('job_detail', args=[self.jobs[1].pk])).context['form'])
+        self.assertEqual(self.client.get(reverse('job_detail', args=[9999])).status_code, 404)
+        # Deleted by another process while still cached here
+        url = reverse('job_detail', args=[make_job(self.employer).pk])
+        self.client.get(url)
+        with mock.patch('jobs.signals.bump_listing_version'):
+            Job.objects.filter(title='Backend Developer').delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(list(response.context['applications']), [self.application])
+
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(len(response.context['jobs']), 8)
+        response = self.client.get(reverse('manage_applications', args=[self.jobs[0].pk]))
+        self.assertEqual(list(response.context['applications']), [self.application])
+        self.assertEqual(response.context['status_counts']['pending'], 1)
+
+        self.client.force_login(self.applicant)
+        response = self.client.get(reverse('manage_applications', args=[self.jobs[0].pk]))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+    def test_login_required(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('dashboard')}", fetch_redirect_response=False)
+
+
+class PerformanceMiddlewareTests(JobsTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        cls.staff = User.objects.create_user('staff', password='pass12345', is_staff=True)
+        cls.jobs = [make_job(cls.employer, title=f'Developer {i}') for i in range(3)]
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        self.addCleanup(registry.clear)
+
+    def test_records_metrics_per_url_name(self):
+        response = self.client.get(reverse('job_list'))
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="5 queries", tpl;dur=[\d.]+, total;dur=')
+
+        samples = registry.snapshot()['job_list']['samples']
+        wall_ms, queries, db_ms, template_ms, size = samples[0]
+        self.assertEqual(queries, 5)
+        self.assertGreater(template_ms, 0)
+        self.assertGreaterEqual(wall_ms, db_ms + template_ms)
+        self.assertEqual(size, len(response.content))
+
+    def test_flags_repeated_queries(self):
+        def n_plus_one_view(request):
+            for job in self.jobs:
+                Job.objects.filter(pk=job.pk).exists()
+            return HttpResponse('ok')
+
+        middleware = PerformanceMiddleware(n_plus_one_view)
+        with self.assertLogs('jobs.performance', 'WARNING') as logs:
+            middleware(RequestFactory().get('/'))
+        self.assertIn('3 executions', logs.output[0])
+        route = registry.snapshot()['unresolved']
+        self.assertEqual(route['duplicate_requests'], 1)
+        self.assertIn('jobs_job', route['last_duplicate'])
+
+    def test_staff_endpoint_and_command(self):
+        for _ in range(3):
+            self.client.get(reverse('job_list'))
+
+        self.client.force_login(self.employer)
+        response = self.client.get(reverse('performance_stats'))
+        self.assertEqual(response.status_code, 302)
+
+        self.client.force_login(self.staff)
+        stats = self.client.get(reverse('performance_stats')).json()['process']
+        self.assertEqual(stats['job_list']['requests'], 3)
+        # The first request fills the page cache; the others run no queries
+        self.assertEqual((stats['job_list']['queries']['p50'], stats['job_list']['queries']['max']), (0, 5))
+        self.assertEqual(set(stats['job_list']['wall_ms']), {'p50', 'p95', 'p99', 'max'})
+
+        registry.publish(force=True)
+        out = StringIO()
+        call_command('perf_stats', stdout=out)
+        self.assertIn('job_list', out.getvalue())
+        self.assertIn('performance_stats', out.getvalue())
+
+
+class BenchmarkCommandTests(JobsTestCase):
+    def test_generate_data_then_benchmark_and_compare(self):
+        call_command(
+            'generate_fake_data', users=40, jobs=30, applications=120, batch_size=25, stdout=StringIO(),
+        )
+        self.assertEqual(Job.objects.count(), 30)
+        self.assertTrue(User.objects.filter(is_employer=True).exists())
+        # Duplicate (job, applicant) pairs are dropped, counters are recounted
+        job = Job.objects.order_by('-application_count').first()
+        self.assertEqual(job.application_count, job.applications.count())
+        self.assertGreater(len({job.created_at.date() for job in Job.objects.all()}), 1)
+        # bulk_create skips the index signals; the command rebuilds the index
+        self.assertIn(job, search_jobs(Job.objects.all(), job.company_name.split()[0]))
+
+        output = os.path.join(self.use_temp_media(), 'run.json')
+        with override_settings(ALLOWED_HOSTS=['localhost']):
+            call_command('benchmark', iterations=2, warmup=1, output=output, stdout=StringIO())
+            out = StringIO()
+            call_command('benchmark', iterations=2, warmup=1, compare=output, scenario=['job_list'], stdout=out)
+
+        with open(output) as results:
+            run = json.load(results)
+        self.assertEqual(run['meta']['jobs'], 30)
+        self.assertIn('manage_applications', run['results'])
+        self.assertEqual(set(run['results']['search']), {
+            'p50_ms', 'p95_ms', 'p99_ms', 'mean_ms', 'queries_min', 'queries_max',
+        })
+        self.assertIn('job_list', out.getvalue().split('scenario')[1])
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+@skipUnless('replica' in settings.DATABASES, 'needs the replica alias from jobportal.settings_test')
+class ReplicaRoutingTests(JobsTestCase):
+    databases = {'default', 'replica'} & settings.DATABASES.keys()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user('employer', password='pass12345', is_employer=True)
+        make_job(cls.employer, title='Primary Job')
+        # The replica lags behind the primary: it only has an older job
+        User.objects.using('replica').bulk_create([User(pk=cls.employer.pk, username='employer', is_employer=True)])
+        Job.objects.using('replica').bulk_create([Job(
+            pk=1000, title='Replica Job', company_name='Acme Ltd', location='Dhaka', description='x', posted_by_id=cls.employer.pk,
+        )])
+
+    def test_anonymous_listing_reads_from_the_replica(self):
+        response = self.client.get(reverse('job_list'))
+        self.assertContains(response, 'Replica Job')
+        self.assertNotContains(response, 'Primary Job')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_writes_go_to_the_primary_and_pin_the_client_to_it(self):
+        self.client.force_login(self.employer)
+        response = self.client.post(reverse('post_job'), {
+            'title': 'Fresh Job', 'company_name': 'Acme Ltd', 'location': 'Dhaka',
+            'job_type': 'full_time', 'description': 'Build things.',
+        })
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertTrue(Job.objects.using('default').filter(title='Fresh Job').exists())
+        self.assertFalse(Job.objects.using('replica').filter(title='Fresh Job').exists())
+
+        # Read your own writes while the cookie lasts
+        response = self.client.get(reverse('job_list'))
+        self.assertContains(response, 'Fresh Job')
+        self.assertNotContains(response, 'Replica Job')
+
+        # Other clients read from the primary too until the replicas have caught up
+        del self.client.cookies[PIN_COOKIE]
+        self.assertContains(self.client.get(reverse('job_list')), 'Fresh Job')
+        cache.clear()
+        self.assertContains(self.client.get(reverse('job_list')), 'Replica Job')
+
+    def test_caches_filled_after_a_write_come_from_the_primary(self):
+        make_job(self.employer, title='Fresh Job')
+        self.assertContains(self.client.get(reverse('job_list')), 'Fresh Job')
+        # Served from the page cache once the replicas are back in use
+        cache.delete(RECENT_WRITE_KEY)
+        with self.assertNumQueries(0, using='replica'):
+            self.assertContains(self.client.get(reverse('job_list')), 'Fresh Job')
+
+    def test_jobs_are_indexed_in_the_database_they_are_saved_to(self):
+        job = Job(title='Lagging Job', company_name='Acme Ltd', location='Dhaka', description='x', posted_by_id=self.employer.pk)
+        job.save(using='replica')
+        self.assertEqual(list(search_jobs(Job.objects.using('replica'), 'lagging')), [job])
+        self.assertFalse(search_jobs(Job.objects.using('default'), 'lagging').exists())
+
+    def test_outside_requests_everything_stays_on_the_primary(self):
+        self.assertEqual(router.db_for_read(Job), 'default')
+        self.assertEqual(set(Job.objects.values_list('title', flat=True)), {'Primary Job'})
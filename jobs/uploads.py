@@ -0,0 +1,37 @@
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+
+
+class HashingUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams each uploaded file to a temporary file chunk by chunk, computing
+    its SHA-256 on the way, and stops reading a file as soon as it passes
+    RESUME_MAX_UPLOAD_SIZE instead of after it has been received in full.
+
+    The digest ends up as ``uploaded_file.sha256``. Rejected fields are
+    listed in ``request.rejected_uploads`` so the form can say why the file
+    is missing.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.RESUME_MAX_UPLOAD_SIZE:
+            if not hasattr(self.request, 'rejected_uploads'):
+                self.request.rejected_uploads = set()
+            self.request.rejected_uploads.add(self.field_name)
+            self.upload_interrupted()
+            raise SkipFile
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.digest.hexdigest()
+        return uploaded_file
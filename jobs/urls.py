@@ -1,17 +1,29 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
+
+# Native coroutine versions of the read-heavy pages, for ASGI deployments
+pages = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('', views.job_list, name='home'),
-    path('jobs/', views.job_list, name='job_list'),  # Added this line
+    path('', pages.job_list, name='home'),
+    path('jobs/', pages.job_list, name='job_list'),  # Added this line
     path('register/', views.register, name='register'),
     path('login/', views.user_login, name='login'),
     path('logout/', views.user_logout, name='logout'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', pages.dashboard, name='dashboard'),
     path('jobs/post/', views.post_job, name='post_job'),
-    path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
-    path('jobs/<int:job_id>/applications/', views.manage_applications, name='manage_applications'),
+    path('jobs/<int:job_id>/', pages.job_detail, name='job_detail'),
+    path('jobs/<int:job_id>/applications/', pages.manage_applications, name='manage_applications'),
+    path('jobs/<int:job_id>/applications/status/', views.bulk_update_application_status,
+         name='bulk_update_application_status'),
+    path('jobs/<int:job_id>/applications/resumes.zip', views.download_resumes, name='download_resumes'),
     path('applications/<int:application_id>/status/', views.update_application_status, name='update_application_status'),
+    path('applications/<int:application_id>/resume/', views.download_resume, name='download_resume'),
+    path('api/jobs/', api.job_search, name='api_job_search'),
+    path('api/jobs/export/', api.job_export, name='api_job_export'),
+    path('api/jobs/suggest/', api.job_suggest, name='api_job_suggest'),
+    path('perf/', views.performance_stats, name='performance_stats'),
 
 
 ]
\ No newline at end of file
@@ -1,13 +1,35 @@
+import os
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib import messages
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from .models import Job, Application, User
+from django.views.decorators.http import condition
+from .models import Job, Application, ResumeBlob, User
 from .forms import JobForm, ApplicationForm, UserRegisterForm
+from .downloads import serve_file, stream_resume_zip
+from .facets import (
+    RADIUS_CHOICES, SORT_CHOICES, SORTS, facet_counts, facet_options, filter_jobs, matching_count, selected_filters,
+    selected_sort,
+)
+from .cache import (
+    cache_public_page, cached_job, cached_similar_jobs, job_detail_etag, job_detail_last_modified, job_state,
+    listing_etag, listing_last_modified, listing_version, revalidate,
+)
+from .pagination import CursorPaginator
+from .performance import published_snapshots, registry, summarize
+from .locations import location_label
+from .salary import CURRENCIES
+from .search import search_jobs
 
+JOBS_PER_PAGE = 6
 
 
 def register(request):
@@ -42,16 +64,13 @@ def user_logout(request):
 @login_required
 def dashboard(request):
     if request.user.is_employer:
-        jobs = Job.objects.filter(posted_by=request.user)
-        for job in jobs:
-            job.application_count = job.applications.count()
-            job.pending_count = job.applications.filter(status='pending').count()
-            job.approved_count = job.applications.filter(status='approved').count()
-            job.rejected_count = job.applications.filter(status='rejected').count()
+        # Application counts are stored on each job, no counting needed
+        jobs = Job.objects.filter(posted_by=request.user).order_by('-created_at')
         return render(request, 'jobs/employer_dashboard.html', {'jobs': jobs})
     else:
         status_filter = request.GET.get('status', '')
-        applications = Application.objects.filter(applicant=request.user)
+        # The job of every card is fetched in the same query
+        applications = Application.objects.filter(applicant=request.user).select_related('job')
         if status_filter and status_filter != 'all':
             applications = applications.filter(status=status_filter)
         return render(request, 'jobs/applicant_dashboard.html', {'applications': applications})
@@ -96,57 +115,83 @@ def post_job(request):
         'job': job  # Pass the job object to the template
     })
 
-from datetime import timedelta
-from django.utils import timezone
-
-def job_list(request):
+def job_list_context(request):
+    """Template context of the job list; the async view runs it in a thread too."""
     query = request.GET.get('q')
     page = request.GET.get('page', 1)
-    
+    cursor = request.GET.get('cursor')
+    sort = selected_sort(request.GET)
+    # Keyset pagination is opt-in (infinite scroll, deep pages) and walks newest first
+    cursor_mode = (cursor is not None or request.GET.get('paginate') == 'cursor') and sort in (None, 'latest')
+
+    filters = selected_filters(request.GET)
+
+    # Only the requested page is fetched, without the large text columns
+    jobs = Job.objects.for_listing().order_by('-created_at', '-id')
+    matching = Job.objects.all()
     if query:
-        jobs = Job.objects.filter(
-            Q(title__icontains=query) |
-            Q(company_name__icontains=query) |
-            Q(location__icontains=query)
-        ).distinct().order_by('-created_at')
+        # Full-text search backed by the index from migration 0005, ranked
+        # unless the feed is walked by cursor (which needs recency order)
+        jobs = search_jobs(jobs, query, rank=not cursor_mode)
+        matching = search_jobs(matching, query, rank=False)
+    jobs = filter_jobs(jobs, filters)
+    if sort:
+        # An explicit sort beats search relevance
+        jobs = jobs.order_by(*SORTS[sort])
+
+    # The facet summary also gives the total, so the listing needs no COUNT of its own
+    counts = facet_counts(matching, filters, query or '')
+    total_count = matching_count(counts, filters)
+    # Links keep the current filters and only swap the page/cursor parameter
+    filter_params = request.GET.copy()
+    for name in ('page', 'cursor'):
+        filter_params.pop(name, None)
+
+    if cursor_mode:
+        jobs_page = CursorPaginator(jobs, JOBS_PER_PAGE).page(cursor)
+        page_range = None
     else:
-        jobs = Job.objects.all().order_by('-created_at')
+        paginator = Paginator(jobs, JOBS_PER_PAGE)
+        paginator.count = total_count
+        try:
+            jobs_page = paginator.page(page)
+        except PageNotAnInteger:
+            jobs_page = paginator.page(1)
+        except EmptyPage:
+            jobs_page = paginator.page(paginator.num_pages)
+        page_range = paginator.get_elided_page_range(jobs_page.number)
 
-    # Mark jobs as new if they were created in the last 7 days
-    seven_days_ago = timezone.now() - timedelta(days=7)
-    for job in jobs:
-        job.is_new = job.created_at > seven_days_ago
+    return {
+        'jobs': jobs_page,
+        'query': query,
+        'cursor_mode': cursor_mode,
+        'page_range': page_range,
+        'filter_query': filter_params.urlencode(),
+        'filters': filters,
+        'sort': sort,
+        'sort_choices': SORT_CHOICES,
+        'currencies': CURRENCIES,
+        'radius_choices': RADIUS_CHOICES,
+        'near_label': location_label(filters['near']) if 'near' in filters else '',
+        'facets': facet_options(counts, filters, request.GET, total_count),
+        'total_count': total_count,
+        'listing_version': listing_version(),
+        'cache_timeout': settings.JOB_PAGE_CACHE_TIMEOUT,
+    }
 
-    paginator = Paginator(jobs, 6)
-    
-    try:
-        jobs_page = paginator.page(page)
-    except PageNotAnInteger:
-        jobs_page = paginator.page(1)
-    except EmptyPage:
-        jobs_page = paginator.page(paginator.num_pages)
-    
-    return render(request, 'jobs/job_list.html', {'jobs': jobs_page, 'query': query})
 
-@login_required
-def manage_applications(request, job_id):
-    job = get_object_or_404(Job, pk=job_id)
-    if request.user != job.posted_by:
-        messages.error(request, "You don't have permission to view these applications.")
-        return redirect('dashboard')
-    
-    applications = job.applications.all().order_by('-applied_at')
-    return render(request, 'jobs/manage_applications.html', {
-        'job': job,
-        'applications': applications
-    })
+@revalidate
+@condition(etag_func=listing_etag, last_modified_func=listing_last_modified)
+@cache_public_page
+def job_list(request):
+    return render(request, 'jobs/job_list.html', job_list_context(request))
 
 @login_required
 def update_application_status(request, application_id):
-    application = get_object_or_404(Application, pk=application_id)
+    application = get_object_or_404(Application.objects.select_related('job'), pk=application_id)
     
     # Check if the user is the employer who posted the job
-    if request.user != application.job.posted_by:
+    if request.user.pk != application.job.posted_by_id:
         messages.error(request, "You don't have permission to update this application.")
         return redirect('dashboard')
     
@@ -156,9 +201,9 @@ def update_application_status(request, application_id):
             # Store old status for comparison
             old_status = application.status
             
-            # Update the status
-            application.status = new_status
-            application.save()
+            # Update the status; the transition is queued for the applicant's
+            # notification in the same transaction
+            Application.objects.filter(pk=application.pk).set_status(new_status, changed_by=request.user)
             
             # Customize message based on the status
             status_messages = {
@@ -182,26 +227,74 @@ def update_application_status(request, application_id):
             messages.error(request, 'Invalid status value')
         
         # Always redirect back to manage applications page
-        return redirect('manage_applications', job_id=application.job.id)
+        return redirect('manage_applications', job_id=application.job_id)
     
     # If not POST, redirect to dashboard
     return redirect('dashboard')
 @login_required
+def bulk_update_application_status(request, job_id):
+    if request.method != 'POST':
+        return redirect('manage_applications', job_id=job_id)
+
+    new_status = request.POST.get('status')
+    if new_status not in dict(Application.STATUS_CHOICES):
+        messages.error(request, 'Invalid status value')
+        return redirect('manage_applications', job_id=job_id)
+    try:
+        ids = {int(pk) for pk in request.POST.getlist('application_ids')}
+    except ValueError:
+        ids = set()
+    if not ids:
+        messages.error(request, 'Select at least one application.')
+        return redirect('manage_applications', job_id=job_id)
+
+    # Ownership is part of the locking query: applications of other
+    # employers' jobs are never matched
+    updated = Application.objects.filter(
+        pk__in=ids, job_id=job_id, job__posted_by=request.user,
+    ).set_status(new_status, changed_by=request.user)
+    if len(updated) < len(ids):
+        messages.error(request, "You don't have permission to update some of the selected applications.")
+    if updated:
+        messages.success(request, f'{len(updated)} application(s) marked as {new_status}.')
+    return redirect('manage_applications', job_id=job_id)
+
+@login_required
+@revalidate
+@condition(etag_func=job_detail_etag, last_modified_func=job_detail_last_modified)
 def job_detail(request, job_id):
-    job = get_object_or_404(Job, pk=job_id)
-    has_applied = Application.objects.filter(job=job, applicant=request.user).exists() if request.user.is_authenticated else False
+    job = cached_job(job_id)
+    # Fresh per-viewer state, already fetched for the conditional GET check;
+    # the applicant count changes without a new listing version
+    state = job_state(request, job_id)
+    if state is None:
+        # Deleted since it was cached
+        raise Http404('No Job matches the given query.')
+    job.application_count = state['application_count']
+    has_applied = state['applied_at'] is not None
     
     if request.method == 'POST' and request.user.is_applicant:
         if has_applied:
             messages.error(request, 'You have already applied for this position.')
             return redirect('job_list')
             
-        form = ApplicationForm(request.POST, request.FILES)
+        # Reading FILES runs the upload handlers, which flag oversized files
+        files = request.FILES
+        form = ApplicationForm(request.POST, files, rejected_uploads=getattr(request, 'rejected_uploads', ()))
         if form.is_valid():
             application = form.save(commit=False)
             application.job = job
             application.applicant = request.user
-            application.save()
+            try:
+                with transaction.atomic():
+                    # Identical resumes share one stored file
+                    application.resume_blob = ResumeBlob.objects.store(form.cleaned_data['resume'])
+                    application.resume = application.resume_blob.file.name
+                    application.save()
+            except IntegrityError:
+                # A concurrent submission got there first (unique_job_applicant)
+                messages.error(request, 'You have already applied for this position.')
+                return redirect('job_list')
             messages.success(request, 'Application submitted successfully!')
             return redirect('dashboard')
     else:
@@ -210,21 +303,24 @@ def job_detail(request, job_id):
     return render(request, 'jobs/job_detail.html', {
         'job': job,
         'form': form,
-        'has_applied': has_applied
+        'has_applied': has_applied,
+        'similar_jobs': cached_similar_jobs(job.pk),
+        'listing_version': listing_version(),
+        'cache_timeout': settings.JOB_PAGE_CACHE_TIMEOUT,
     })
 
 @login_required
 def manage_applications(request, job_id):
     job = get_object_or_404(Job, pk=job_id)
-    if request.user != job.posted_by:
+    if request.user.pk != job.posted_by_id:
         messages.error(request, "You don't have permission to view these applications.")
         return redirect('dashboard')
     
     # Get status filter from query params, default to 'all'
     status_filter = request.GET.get('status', 'all')
     
-    # Start with all applications for this job
-    applications = job.applications.all()
+    # Start with all applications for this job, applicants joined in
+    applications = job.applications.select_related('applicant')
     
     # Apply status filter if specified
     if status_filter != 'all' and status_filter in dict(Application.STATUS_CHOICES):
@@ -236,12 +332,12 @@ def manage_applications(request, job_id):
         '-applied_at'  # Then sort by application date
     )
     
-    # Count applications by status
+    # Count applications by status, read from the job's stored counters
     status_counts = {
-        'total': job.applications.count(),
-        'pending': job.applications.filter(status='pending').count(),
-        'approved': job.applications.filter(status='approved').count(),
-        'rejected': job.applications.filter(status='rejected').count(),
+        'total': job.application_count,
+        'pending': job.pending_count,
+        'approved': job.approved_count,
+        'rejected': job.rejected_count,
     }
     
     return render(request, 'jobs/manage_applications.html', {
@@ -253,10 +349,44 @@ def manage_applications(request, job_id):
 
 
 
+@login_required
+def download_resume(request, application_id):
+    application = get_object_or_404(Application.objects.select_related('job', 'applicant'), pk=application_id)
+
+    # Only the employer who posted the job and the applicant may see the resume
+    if request.user.pk not in (application.job.posted_by_id, application.applicant_id):
+        messages.error(request, "You don't have permission to view this resume.")
+        return redirect('dashboard')
+
+    extension = os.path.splitext(application.resume.name)[1]
+    return serve_file(request, application.resume.name, f'{application.applicant.username}-resume{extension}')
+
+@login_required
+def download_resumes(request, job_id):
+    job = get_object_or_404(Job, pk=job_id)
+    if request.user.pk != job.posted_by_id:
+        messages.error(request, "You don't have permission to download these resumes.")
+        return redirect('dashboard')
+
+    applications = job.applications.order_by('applied_at', 'pk')
+    status_filter = request.GET.get('status', 'all')
+    if status_filter in dict(Application.STATUS_CHOICES):
+        applications = applications.filter(status=status_filter)
+    rows = applications.values_list(
+        'pk', 'applicant__username', 'applicant__email', 'status', 'applied_at', 'resume',
+    )
+
+    response = StreamingHttpResponse(
+        stream_resume_zip(lambda: rows.iterator(chunk_size=500)), content_type='application/zip',
+    )
+    suffix = '' if status_filter == 'all' else f'-{status_filter}'
+    response['Content-Disposition'] = f'attachment; filename="job-{job.pk}-resumes{suffix}.zip"'
+    return response
+
 @login_required
 def applicant_dashboard(request):
     status = request.GET.get('status', 'all')
-    applications = Application.objects.filter(applicant=request.user)
+    applications = Application.objects.filter(applicant=request.user).select_related('job')
     if status != 'all':
         applications = applications.filter(status=status)
 
@@ -273,3 +403,12 @@ def applicant_dashboard(request):
         'status_filter': status,
         'status_options': status_options,
     })
+
+
+@staff_member_required
+def performance_stats(request):
+    """p50/p95/p99 per URL name for this process and for every process that published to the cache."""
+    return JsonResponse({
+        'process': summarize(registry.snapshot()),
+        'all_processes': summarize(*published_snapshots()),
+    })
@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobportal.settings')
+    # The test suite also needs the replica alias declared in settings_test
+    settings_module = 'jobportal.settings_test' if sys.argv[1:2] == ['test'] else 'jobportal.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc: